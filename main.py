@@ -10,6 +10,7 @@ import os
 import sys
 import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import date
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
@@ -362,6 +363,19 @@ def _append_failure(
     )
 
 
+def _collect_markdown(future: Future[str] | None, result: PipelineResult) -> BaseException | None:
+    """Wait for the background markdown write; record its path or log and return its error."""
+    if future is None:
+        return None
+    error = future.exception()
+    if error is None:
+        result.markdown_path = future.result()
+        logger.info("[DELIVERY] Markdown digest saved: %s", result.markdown_path)
+    else:
+        logger.error("[DELIVERY] Markdown digest failed: %s", error)
+    return error
+
+
 def _write_json(path: str, data: dict) -> None:
     with open(path, "w", encoding="utf-8") as handle:
         json.dump(data, handle, ensure_ascii=False, indent=2)
@@ -637,70 +651,90 @@ def run_pipeline(args: argparse.Namespace) -> PipelineResult:
             print("\n" + render_digest_text(analyzed, today, pending_articles=pending_articles))
             logger.info("[DELIVERY] Dry run output printed")
         else:
-            if args.output in ("email", "both"):
-                # Multi-channel delivery based on profiles
-                for profile in RECIPIENT_PROFILES:
-                    if profile.delivery_channel not in ("email", "both"):
-                        continue
-
-                    # Filter articles for this persona
-                    # Logic: Include if article is explicitly tagged for this persona,
-                    # OR if article has no tags and this is the default "student" persona.
-                    profile_articles = [
-                        a for a in analyzed
-                        if profile.persona in (a.target_personas or [])
-                        or (not a.target_personas and profile.persona == "student")
-                    ]
-
-                    if not profile_articles:
-                        logger.info(f"[DELIVERY] No articles for profile '{profile.name}'")
-                        continue
+            # Start the markdown write now so it runs beside the SMTP round trips below.
+            markdown_future = None
+            if args.output in ("markdown", "both"):
+                side_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="markdown")
+                markdown_future = side_pool.submit(
+                    save_digest_markdown, analyzed, today=today, output_dir=args.output_dir
+                )
+                side_pool.shutdown(wait=False)
 
-                    logger.info(f"[DELIVERY] Sending {len(profile_articles)} articles to '{profile.name}'")
-                    success = send_email(
-                        profile_articles,
-                        today,
-                        profile=profile,
-                        pending_articles=pending_articles,
-                    )
-
-                    if args.strict and not success:
-                         logger.error(f"[DELIVERY] Failed to send email to '{profile.name}'")
-                         # In strict mode, maybe we should raise? But let's verify other profiles first or fail hard.
-                         # User requested "fail run on any critical stage error"
-                         raise RuntimeError(f"Email delivery failed for profile {profile.name}")
-
-                result.email_sent = True # Mark as sent if we got here (individual failures raised if strict)
-
-                # 转发阶段 (Forward to external recipients after review)
-                if args.forward:
-                    import copy
-                    from config import EXTERNAL_RECIPIENTS
-                    for persona, addrs in EXTERNAL_RECIPIENTS.items():
-                        matching = [p for p in RECIPIENT_PROFILES if p.persona == persona]
-                        if not matching:
-                            logger.warning("[FORWARD] No profile found for persona '%s'", persona)
+            try:
+                if args.output in ("email", "both"):
+                    # Multi-channel delivery based on profiles
+                    for profile in RECIPIENT_PROFILES:
+                        if profile.delivery_channel not in ("email", "both"):
                             continue
-                        base_profile = matching[0]
-                        fwd_articles = [
+
+                        # Filter articles for this persona
+                        # Logic: Include if article is explicitly tagged for this persona,
+                        # OR if article has no tags and this is the default "student" persona.
+                        profile_articles = [
                             a for a in analyzed
-                            if persona in (a.target_personas or [])
-                            or (not a.target_personas and persona == "student")
+                            if profile.persona in (a.target_personas or [])
+                            or (not a.target_personas and profile.persona == "student")
                         ]
-                        if not fwd_articles:
-                            logger.info("[FORWARD] No articles for persona '%s', skipping", persona)
+
+                        if not profile_articles:
+                            logger.info(f"[DELIVERY] No articles for profile '{profile.name}'")
                             continue
-                        for addr in addrs:
-                            fwd_profile = copy.copy(base_profile)
-                            fwd_profile.email = addr
-                            logger.info("[FORWARD] Sending to external: %s (%s)", addr, persona)
-                            send_email(fwd_articles, today, profile=fwd_profile, pending_articles=pending_articles)
 
-            if args.output in ("markdown", "both"):
-                result.markdown_path = save_digest_markdown(
-                    analyzed, today=today, output_dir=args.output_dir
-                )
-                logger.info("[DELIVERY] Markdown digest saved: %s", result.markdown_path)
+                        logger.info(f"[DELIVERY] Sending {len(profile_articles)} articles to '{profile.name}'")
+                        success = send_email(
+                            profile_articles,
+                            today,
+                            profile=profile,
+                            pending_articles=pending_articles,
+                        )
+
+                        if args.strict and not success:
+                             logger.error(f"[DELIVERY] Failed to send email to '{profile.name}'")
+                             # In strict mode, maybe we should raise? But let's verify other profiles first or fail hard.
+                             # User requested "fail run on any critical stage error"
+                             raise RuntimeError(f"Email delivery failed for profile {profile.name}")
+
+                    result.email_sent = True # Mark as sent if we got here (individual failures raised if strict)
+
+                    # 转发阶段 (Forward to external recipients after review)
+                    if args.forward:
+                        from config import EXTERNAL_RECIPIENTS
+                        for persona, addrs in EXTERNAL_RECIPIENTS.items():
+                            matching = [p for p in RECIPIENT_PROFILES if p.persona == persona]
+                            if not matching:
+                                logger.warning(
+                                    "[FORWARD] No profile found for persona '%s'", persona
+                                )
+                                continue
+                            base_profile = matching[0]
+                            fwd_articles = [
+                                a for a in analyzed
+                                if persona in (a.target_personas or [])
+                                or (not a.target_personas and persona == "student")
+                            ]
+                            if not fwd_articles:
+                                logger.info(
+                                    "[FORWARD] No articles for persona '%s', skipping", persona
+                                )
+                                continue
+                            if not addrs:
+                                continue
+                            logger.info(
+                                "[FORWARD] Sending to external: %s (%s)", ", ".join(addrs), persona
+                            )
+                            # One render + encode per persona; every address still gets its own copy.
+                            send_email(
+                                fwd_articles,
+                                today,
+                                profile=base_profile,
+                                pending_articles=pending_articles,
+                                recipients=list(addrs),
+                            )
+            finally:
+                # Collected even when a strict-mode send raised, so the write's outcome is kept.
+                markdown_error = _collect_markdown(markdown_future, result)
+            if markdown_error is not None:
+                raise markdown_error
 
             if args.output in ("notion", "both"):
                 from src.delivery.notion_sender import push_to_notion
@@ -3,17 +3,26 @@ LLM Analyzer Module
 负责调用 LLM (Local Ollama / NVIDIA NIM) 对文章进行深度分析，提取结构化信息。
 """
 
+import atexit
+import contextlib
+import email.utils
+import functools
+import hashlib
 import json
 import logging
 import os
 import re
+import statistics
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Any
-from openai import OpenAI
+from openai import APIStatusError, APITimeoutError, OpenAI
 
 from src.models import Article, AnalyzedArticle
+from src.json_compat import json_loads, orjson_dumps
 from config import LLM_API_KEY, LLM_BASE_URL, LLM_MODEL, API_PROVIDER
 
 logger = logging.getLogger(__name__)
@@ -30,17 +39,310 @@ if IS_LOCAL:
 else:
     MAX_TOKENS = int(os.getenv("KIMI_MAX_TOKENS", "800"))
 REQUEST_TIMEOUT_SECONDS = float(os.getenv("KIMI_TIMEOUT_SECONDS", "60"))
+# Optional wall-clock cap for a whole analyze_articles batch (0 = no cap).
+# Per-request timeouts are enforced by the client.
+ANALYSIS_DEADLINE_SECONDS = float(os.getenv("KIMI_ANALYSIS_DEADLINE_SECONDS", "0"))
 MAX_CONCURRENCY = max(1, int(os.getenv("KIMI_MAX_CONCURRENCY", "1" if IS_LOCAL else "4")))
 CLIENT_MAX_RETRIES = int(os.getenv("KIMI_CLIENT_MAX_RETRIES", "1" if IS_LOCAL else "0"))
 MIN_REQUEST_INTERVAL_SECONDS = float(os.getenv("KIMI_MIN_REQUEST_INTERVAL_SECONDS", "2.0" if not IS_LOCAL else "0.2"))
+# Sliding-window quotas (0 = unlimited). RPM defaults to the legacy minimum interval,
+# except for a single local worker at the default 0.2s, which can never reach it.
+_throttle_needed = MIN_REQUEST_INTERVAL_SECONDS > 0 and not (
+    MAX_CONCURRENCY == 1 and MIN_REQUEST_INTERVAL_SECONDS <= 0.2
+)
+REQUESTS_PER_MINUTE = int(
+    os.getenv(
+        "KIMI_RPM",
+        str(int(60 / MIN_REQUEST_INTERVAL_SECONDS)) if _throttle_needed else "0",
+    )
+)
+TOKENS_PER_MINUTE = int(os.getenv("KIMI_TPM", "0"))
+# Pause before the provider's own quota runs out (fraction of x-ratelimit-limit-*).
+RATE_LIMIT_HEADROOM = float(os.getenv("KIMI_RATE_LIMIT_HEADROOM", "0.1"))
+# AIMD concurrency: rolling latency above this target (0 = off) counts as congestion.
+LATENCY_TARGET_SECONDS = float(os.getenv("KIMI_LATENCY_TARGET_SECONDS", "0"))
 RATE_LIMIT_BACKOFF_SECONDS = float(os.getenv("KIMI_RATE_LIMIT_BACKOFF_SECONDS", "10"))
 MAX_RATE_LIMIT_RETRIES = int(os.getenv("KIMI_RATE_LIMIT_MAX_RETRIES", "2"))
 # For local inference, keep retries conservative to avoid long backlogs.
 LOCAL_ENABLE_FINAL_RETRY = os.getenv("LOCAL_ENABLE_FINAL_RETRY", "false").lower() == "true"
 LOCAL_SNIPPET_LIMIT = int(os.getenv("KIMI_LOCAL_SNIPPET_LIMIT", "300"))
+# Warm the connection pool with GET /models when the client is created (cloud default).
+PREWARM_CONNECTION = os.getenv("LLM_PREWARM", "false" if IS_LOCAL else "true").lower() == "true"
+# Local: the student reply's German fields skip the technician call once they reach this length.
+LOCAL_DE_MIN_CHARS = int(os.getenv("KIMI_LOCAL_DE_MIN_CHARS", "16"))
+# Upper bound for the Ollama num_ctx (KV cache is allocated for the full window).
+LOCAL_NUM_CTX_MAX = int(os.getenv("KIMI_LOCAL_NUM_CTX", "4096"))
+# Snippet slice sent by the primary (and packed) request.
+PRIMARY_SNIPPET_LIMIT = LOCAL_SNIPPET_LIMIT if IS_LOCAL else 800
+# Content-hash result cache: reposts/syndicated copies reuse an earlier analysis.
+# Set a path to persist it between runs; empty keeps it in memory only.
+RESULT_CACHE_PATH = os.getenv("LLM_RESULT_CACHE_PATH", "").strip()
+# Oldest (least recently used) entries are dropped beyond this size, in memory and on disk.
+RESULT_CACHE_MAX_ENTRIES = max(1, int(os.getenv("LLM_RESULT_CACHE_MAX_ENTRIES", "5000")))
 LOCAL_RETRY_SNIPPET_LIMIT = int(os.getenv("KIMI_LOCAL_RETRY_SNIPPET_LIMIT", "220"))
-_rate_lock = threading.Lock()
-_last_request_ts = 0.0
+# Longest slice any prompt variant in analyze_article takes (primary, cloud short, retries).
+_SNIPPET_BOUND = max(PRIMARY_SNIPPET_LIMIT, LOCAL_RETRY_SNIPPET_LIMIT, 350, 180)
+# Size max_tokens from the observed completion lengths (p95 * 1.2) instead of the fixed cap;
+# local engines reserve KV cache proportional to the declared budget.
+ADAPTIVE_MAX_TOKENS = os.getenv("KIMI_ADAPTIVE_MAX_TOKENS", "true").lower() == "true"
+ADAPTIVE_MIN_TOKENS = 256
+ADAPTIVE_WINDOW = 200
+ADAPTIVE_REFRESH_EVERY = 20
+# Stream completions and stop reading once the first JSON object closes (skips tail tokens).
+STREAM_RESPONSES = (
+    os.getenv("KIMI_STREAM_RESPONSES", "true" if IS_LOCAL else "false").lower() == "true"
+)
+# Streamed output that is still prose/markdown after this many chars is abandoned (0 = off).
+STREAM_ABORT_CHARS = int(os.getenv("KIMI_STREAM_ABORT_CHARS", "2000"))
+# Constrain decoding to the analysis schema: Ollama accepts a JSON schema as `format`
+# (on by default); cloud response_format=json_schema is opt-in since support varies.
+LOCAL_SCHEMA_FORMAT = os.getenv("KIMI_LOCAL_SCHEMA_FORMAT", "true").lower() == "true"
+CLOUD_JSON_SCHEMA = os.getenv("KIMI_CLOUD_JSON_SCHEMA", "false").lower() == "true"
+# Cloud only: pack this many articles into one request (1 = one request per article).
+# Local Ollama stays at one article per request: a pack's num_predict would outgrow
+# LOCAL_NUM_CTX_MAX, and packed results skip the technician (TECHNICIAN_DE_PROMPT) pass.
+BATCH_SIZE = max(1, int(os.getenv("LLM_BATCH_SIZE", "1")))
+# Send a stable prompt_cache_key so providers with prompt caching reuse the system prefix.
+PROMPT_CACHE_ENABLED = os.getenv("KIMI_PROMPT_CACHE", "false").lower() == "true"
+MINIMAL_RETRY_MAX_TOKENS = min(MAX_TOKENS, int(os.getenv("KIMI_MINIMAL_RETRY_MAX_TOKENS", "600")))
+# Cloud only: race the full and shortened prompts for sources whose first attempt often fails.
+SPECULATIVE_RETRY = os.getenv("LLM_SPECULATIVE_RETRY", "false").lower() == "true"
+# A non-streamed loser cannot be cancelled: it holds a provider slot and its token budget
+# until it completes. Racing without KIMI_STREAM_RESPONSES therefore needs this second opt-in.
+SPECULATIVE_NON_STREAMED = os.getenv("LLM_SPECULATIVE_NON_STREAMED", "false").lower() == "true"
+SPECULATIVE_FAILURE_RATE = float(os.getenv("LLM_SPECULATIVE_FAILURE_RATE", "0.3"))
+SPECULATIVE_MIN_SAMPLES = 3
+_completion_lock = threading.Lock()
+_completion_tokens: deque[int] = deque(maxlen=ADAPTIVE_WINDOW)
+_completion_samples = 0
+_adaptive_max_tokens = MAX_TOKENS
+_source_stats_lock = threading.Lock()
+_source_attempts: Counter[str] = Counter()
+_source_failures: Counter[str] = Counter()
+_speculative_executor: ThreadPoolExecutor | None = None
+
+_result_cache_lock = threading.Lock()
+_result_cache: dict[str, dict[str, Any]] = {}
+_result_cache_loaded = False
+
+# JSON repair patterns, compiled once for the per-response extraction path.
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_MD_BLOCK_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?```", re.DOTALL)
+_MD_UNCLOSED_RE = re.compile(r"```(?:json)?\s*\n?(.*)$", re.DOTALL)
+# Smart quotes/BOM normalised, control chars other than \t \n \r dropped, in one translate.
+_REPAIR_TABLE = str.maketrans(
+    {"\u201c": '"', "\u201d": '"', "\u2019": "'", "\ufeff": ""}
+    | {c: None for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)}
+)
+# Inside string literals the remaining whitespace controls must be escaped.
+_STRING_CTRL_TABLE = {0x09: "\\t", 0x0A: "\\n", 0x0D: "\\r"} | {
+    c: None for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)
+}
+_JSON_STRING_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+def _escape_controls_in_strings(s: str) -> str:
+    """Escape raw control chars inside quoted strings (invalid JSON from local models)."""
+    return _JSON_STRING_RE.sub(lambda m: m.group().translate(_STRING_CTRL_TABLE), s)
+
+
+class SlidingWindowLimiter:
+    """
+    Requests-per-minute + tokens-per-minute limiter over a sliding window.
+    Concurrent workers proceed freely until a quota is used up, then sleep exactly
+    until the oldest entry leaves the window.
+    """
+
+    def __init__(self, rpm: int, tpm: int, window_seconds: float = 60.0) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window_seconds = window_seconds
+        self._requests: deque[float] = deque()
+        self._tokens: deque[tuple[float, int]] = deque()
+        self._token_total = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= cutoff:
+            self._token_total -= self._tokens.popleft()[1]
+
+    def _wait_seconds(self, now: float, est_tokens: int) -> float:
+        wait_s = self._paused_until - now
+        if self.rpm > 0 and len(self._requests) >= self.rpm:
+            wait_s = self._requests[0] + self.window_seconds - now
+        overflow = self._token_total + est_tokens - self.tpm
+        if self.tpm > 0 and self._tokens and overflow > 0:
+            freed = 0
+            for ts, tokens in self._tokens:
+                freed += tokens
+                if freed >= overflow:
+                    wait_s = max(wait_s, ts + self.window_seconds - now)
+                    break
+        return wait_s
+
+    def acquire(self, est_tokens: int = 0) -> None:
+        """Block until one request of ~est_tokens fits both quotas, then record it."""
+        if self.rpm <= 0 and self.tpm <= 0 and self._paused_until <= time.monotonic():
+            return  # Nothing to enforce: skip the lock (single local worker by default).
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                wait_s = self._wait_seconds(now, est_tokens)
+                if wait_s <= 0:
+                    self._requests.append(now)
+                    if self.tpm > 0:
+                        self._tokens.append((now, est_tokens))
+                        self._token_total += est_tokens
+                    return
+            time.sleep(wait_s)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for `seconds` (server-advertised reset or Retry-After)."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe_headers(self, headers: Any) -> None:
+        """
+        Pause proactively when the provider reports <10% of a quota left.
+        Reads x-ratelimit-{remaining,limit,reset}-{requests,tokens}; absent headers are ignored.
+        """
+        if not headers:
+            return
+        for kind in ("requests", "tokens"):
+            remaining = _header_float(headers, f"x-ratelimit-remaining-{kind}")
+            limit = _header_float(headers, f"x-ratelimit-limit-{kind}")
+            if remaining is None or not limit or remaining >= limit * RATE_LIMIT_HEADROOM:
+                continue
+            reset = _parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            wait_s = reset if reset is not None else 1.0
+            logger.info(
+                f"[{API_PROVIDER}] {kind} quota low ({remaining:.0f}/{limit:.0f}), pausing {wait_s:.1f}s"
+            )
+            self.pause(wait_s)
+
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _header_float(headers: Any, name: str) -> float | None:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """Parse reset durations such as "20ms", "1.5s" or "6m0s" into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+
+def _retry_after_seconds(headers: Any) -> float | None:
+    """Retry-After as delta-seconds or HTTP date; None when absent or unparseable."""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight analyses.
+    Successes raise the cap by alpha up to c_max; 429/5xx/timeouts (or rolling
+    latency above the target) multiply it by beta down to c_min.
+    """
+
+    def __init__(
+        self,
+        c_max: int,
+        c_min: int = 1,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        latency_target: float = 0.0,
+        window: int = 10,
+    ) -> None:
+        self.c_max = c_max
+        self.c_min = c_min
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_target = latency_target
+        self.current = float(c_max)
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self.current):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def increase(self) -> None:
+        with self._cond:
+            self.current = min(float(self.c_max), self.current + self.alpha)
+            self._cond.notify_all()
+
+    def decrease(self) -> None:
+        with self._cond:
+            previous = int(self.current)
+            self.current = max(float(self.c_min), self.current * self.beta)
+        if int(self.current) < previous:
+            logger.warning(f"[{API_PROVIDER}] Congestion: concurrency {previous} -> {int(self.current)}")
+
+    def on_success(self, latency_seconds: float) -> None:
+        """Record a completed call; slow rolling latency is treated like congestion."""
+        with self._cond:
+            self._latencies.append(latency_seconds)
+            average = sum(self._latencies) / len(self._latencies)
+        if self.latency_target > 0 and average > self.latency_target:
+            self.decrease()
+        else:
+            self.increase()
+
+
+_limiter = SlidingWindowLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+# Set by a 429, cleared by the next 2xx: meanwhile only one request is in flight.
+_throttled = threading.Event()
+_throttled_gate = threading.Lock()
+_concurrency = AIMDController(MAX_CONCURRENCY, latency_target=LATENCY_TARGET_SECONDS)
+
 
 def _get_client() -> OpenAI:
     """Lazy-init API client (延迟初始化 API 客户端)."""
@@ -54,102 +356,325 @@ def _get_client() -> OpenAI:
             api_key=LLM_API_KEY,
             base_url=LLM_BASE_URL,
             max_retries=CLIENT_MAX_RETRIES,
+            http_client=_build_http_client(),
         )
+        if PREWARM_CONNECTION:
+            _prewarm(_client)
     return _client
 
 
+def _prewarm(client: OpenAI) -> None:
+    """Open the pooled connection (TCP + TLS) before the first analysis call needs it."""
+    try:
+        client.models.list(timeout=5.0)
+    except Exception as e:  # Best effort: the real call reports actual errors.
+        logger.debug(f"[{API_PROVIDER}] Connection prewarm failed: {e}")
+
+
+def _build_http_client() -> Any:
+    """
+    Keep-alive pool shared by every call (复用连接池).
+    Retries and fallback prompts reuse warm sockets instead of a fresh TCP/TLS handshake.
+    Returns None (the SDK's default transport) if the pool cannot be built.
+    """
+    try:
+        # The SDK's own client class, so this follows whichever HTTP package openai ships with.
+        from openai import DEFAULT_CONNECTION_LIMITS, DefaultHttpxClient
+    except ImportError as e:
+        logger.warning(f"[{API_PROVIDER}] Shared connection pool unavailable, using default: {e}")
+        return None
+
+    try:
+        import h2  # noqa: F401  # HTTP/2 needs the optional h2 package.
+
+        http2 = not IS_LOCAL
+    except ImportError:
+        http2 = False
+    pool_size = MAX_CONCURRENCY * 4
+    try:
+        http_client = DefaultHttpxClient(
+            http2=http2,
+            limits=type(DEFAULT_CONNECTION_LIMITS)(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=600.0,
+            ),
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        logger.warning(f"[{API_PROVIDER}] Shared connection pool unavailable, using default: {e}")
+        return None
+    atexit.register(http_client.close)
+    return http_client
+
+
+def _reset_after_fork() -> None:
+    """Give a forked child its own connection pool, locks and throttle state."""
+    global _client, _limiter, _concurrency, _completion_lock, _source_stats_lock
+    global _speculative_executor, _throttled, _throttled_gate, _result_cache_lock
+    # The inherited httpx pool shares sockets with the parent; rebuild lazily.
+    _client = None
+    _limiter = SlidingWindowLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
+    _concurrency = AIMDController(MAX_CONCURRENCY, latency_target=LATENCY_TARGET_SECONDS)
+    _throttled = threading.Event()
+    _throttled_gate = threading.Lock()
+    _completion_lock = threading.Lock()
+    _source_stats_lock = threading.Lock()
+    _result_cache_lock = threading.Lock()
+    # Worker threads do not survive fork.
+    _speculative_executor = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _current_max_tokens() -> int:
+    """Per-request max_tokens: adaptive estimate once enough samples exist, else MAX_TOKENS."""
+    if not ADAPTIVE_MAX_TOKENS:
+        return MAX_TOKENS
+    return _adaptive_max_tokens
+
+
+def _record_completion_tokens(tokens: int | None, finish_reason: str | None) -> None:
+    """Feed completion length into the rolling window and refresh the p95 estimate."""
+    global _completion_samples, _adaptive_max_tokens
+    if not ADAPTIVE_MAX_TOKENS:
+        return
+    # Truncated output says nothing about the real length; count it as a full budget.
+    if finish_reason == "length":
+        tokens = MAX_TOKENS
+    if not isinstance(tokens, int) or tokens <= 0:
+        return
+
+    with _completion_lock:
+        _completion_tokens.append(tokens)
+        _completion_samples += 1
+        if _completion_samples % ADAPTIVE_REFRESH_EVERY != 0:
+            return
+        p95 = statistics.quantiles(_completion_tokens, n=20)[18]
+        _adaptive_max_tokens = int(min(MAX_TOKENS, max(ADAPTIVE_MIN_TOKENS, p95 * 1.2)))
+    logger.info(f"[{API_PROVIDER}] Adaptive max_tokens -> {_adaptive_max_tokens} (p95={p95:.0f})")
+
+
+@functools.lru_cache(maxsize=16)
+def _prompt_cache_key(system_prompt: str) -> str:
+    """Cache key versioned by the prompt text, so prompt edits start a fresh cache entry."""
+    digest = hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:12]
+    return f"industrial-ai-analyzer-{digest}"
+
+
+@functools.lru_cache(maxsize=16)
+def _system_message(system_prompt: str) -> dict[str, str]:
+    """Shared system message per prompt constant; the client only reads it."""
+    return {"role": "system", "content": system_prompt}
+
+
+@functools.lru_cache(maxsize=16)
+def _prompt_cache_body(system_prompt: str) -> dict[str, str]:
+    return {"prompt_cache_key": _prompt_cache_key(system_prompt)}
+
+
+# Structural JSON characters; everything between them is skipped in C.
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+class _JsonObjectTracker:
+    """Incremental brace/string state over streamed text; reports when the first object closes."""
+
+    __slots__ = ("depth", "in_string", "escaped", "started")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a delta; True once the first top-level object is balanced."""
+        # Same structural-character skip as _scan_json_state; an escape may span deltas.
+        skip = 0 if self.escaped else -1
+        self.escaped = False
+        for match in _JSON_TOKEN_RE.finditer(chunk):
+            i = match.start()
+            if i == skip:
+                continue
+            ch = chunk[i]
+            if self.in_string:
+                if ch == '"':
+                    self.in_string = False
+                elif ch == "\\":
+                    if i + 1 == len(chunk):
+                        self.escaped = True
+                    else:
+                        skip = i + 1
+                continue
+            if ch == "{":
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                # Ignore prose/markdown before the object opens.
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+def _consume_stream(
+    stream: Any, cancel: threading.Event | None = None
+) -> tuple[str, str | None, int]:
+    """
+    Collect streamed deltas until the first JSON object closes (or cancel is set),
+    then drop the connection. Output with no "{" after STREAM_ABORT_CHARS is abandoned
+    early (finish_reason "no_json") so the worker is freed.
+    Returns (text, finish_reason, content_chunks); chunks approximate completion tokens.
+    """
+    tracker = _JsonObjectTracker()
+    parts: list[str] = []
+    reasoning_parts: list[str] = []
+    finish_reason: str | None = None
+    content_chunks = 0
+    prefix_chars = 0
+    try:
+        for chunk in stream:
+            if cancel is not None and cancel.is_set():
+                finish_reason = "cancelled"
+                break
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = getattr(choice, "finish_reason", None) or finish_reason
+            delta = choice.delta
+            content = getattr(delta, "content", None)
+            if isinstance(content, str) and content:
+                content_chunks += 1
+                parts.append(content)
+                if tracker.feed(content):
+                    finish_reason = finish_reason or "object_closed"
+                    break
+                if not tracker.started and STREAM_ABORT_CHARS > 0:
+                    prefix_chars += len(content)
+                    if prefix_chars > STREAM_ABORT_CHARS:
+                        finish_reason = "no_json"
+                        break
+                continue
+            reasoning = getattr(delta, "reasoning_content", None)
+            if isinstance(reasoning, str) and reasoning:
+                reasoning_parts.append(reasoning)
+    finally:
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
+
+    text = "".join(parts).strip() or "".join(reasoning_parts).strip()
+    return text, finish_reason, content_chunks
+
+
+def _scan_json_state(s: str) -> tuple[int, int, bool]:
+    """
+    Single string-aware pass over JSON-ish text.
+    Returns (index of the "}" closing the first top-level object or -1,
+    unclosed brace depth at the end, whether the text ends inside a string).
+    """
+    balanced_end = -1
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in _JSON_TOKEN_RE.finditer(s):
+        i = match.start()
+        if i == escaped_at:
+            continue
+        ch = s[i]
+        if in_string:
+            if ch == '"':
+                in_string = False
+            elif ch == "\\":
+                escaped_at = i + 1
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0 and balanced_end == -1:
+                balanced_end = i
+    return balanced_end, depth, in_string
+
+
 def _extract_json(text: str) -> dict | None:
     """
     Robustly extract a JSON object from model output.
     从模型输出中鲁棒地提取 JSON 对象。
     Handles: pure JSON, markdown code blocks, JSON embedded in free text.
     """
+    return _extract_json_with_reason(text)[0]
+
+
+def _json_error_message(exc: json.JSONDecodeError) -> str:
+    return f"{exc.msg} at line {exc.lineno}, column {exc.colno} (char {exc.pos})"
+
+
+def _extract_json_with_reason(text: str) -> tuple[dict | None, str]:
+    """
+    _extract_json plus a failure reason built from the attempts already made,
+    e.g. "tail_autoclose: Expecting value at line 3, column 12 (char 40)".
+    The reason is empty on success.
+    """
     if not text or not text.strip():
-        return None
+        return None, "empty response text"
 
     raw = text.strip()
 
-    def _escape_controls_in_strings(s: str) -> str:
-        """Escape raw control chars inside quoted strings (invalid JSON from local models)."""
-        out: list[str] = []
-        in_string = False
-        escaped = False
-        for ch in s:
-            if escaped:
-                out.append(ch)
-                escaped = False
-                continue
-            if ch == "\\":
-                out.append(ch)
-                if in_string:
-                    escaped = True
-                continue
-            if ch == '"':
-                out.append(ch)
-                in_string = not in_string
-                continue
-            if in_string:
-                if ch == "\n":
-                    out.append("\\n")
-                    continue
-                if ch == "\r":
-                    out.append("\\r")
-                    continue
-                if ch == "\t":
-                    out.append("\\t")
-                    continue
-                if ord(ch) < 0x20:
-                    continue
-            out.append(ch)
-        return "".join(out)
+    # Fast path: a clean object (the norm under JSON mode) skips every repair strategy.
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+    if raw[0] == "{" and raw[-1] == "}":
+        try:
+            parsed = json_loads(raw)
+            if isinstance(parsed, dict):
+                return parsed, ""
+            return None, f"raw: top-level type is {type(parsed).__name__}, expected object"
+        except json.JSONDecodeError:
+            pass
+
+    failures: list[str] = []
 
-    def _try_parse(candidate: str) -> dict | None:
+    def _try_parse(label: str, candidate: str, direct: bool = True) -> dict | None:
         s = (candidate or "").strip()
         if not s:
             return None
-        try:
-            parsed = json.loads(s)
-            return parsed if isinstance(parsed, dict) else None
-        except json.JSONDecodeError:
-            # Common repairs for local model outputs
-            repaired = s.replace("“", '"').replace("”", '"').replace("’", "'")
-            repaired = repaired.replace("\ufeff", "")
-            repaired = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F]', "", repaired)
-            repaired = _escape_controls_in_strings(repaired)
-            repaired = re.sub(r",\s*([}\]])", r"\1", repaired)
+        if direct:
             try:
-                parsed = json.loads(repaired)
-                return parsed if isinstance(parsed, dict) else None
-            except json.JSONDecodeError:
+                parsed = json_loads(s)
+                if isinstance(parsed, dict):
+                    return parsed
+                failures.append(f"{label}: top-level type is {type(parsed).__name__}, expected object")
                 return None
+            except json.JSONDecodeError:
+                pass
+        # Common repairs for local model outputs
+        repaired = _escape_controls_in_strings(s.translate(_REPAIR_TABLE))
+        repaired = _TRAILING_COMMA_RE.sub(r"\1", repaired)
+        try:
+            parsed = json_loads(repaired)
+        except json.JSONDecodeError as exc:
+            failures.append(f"{label}: {_json_error_message(exc)}")
+            return None
+        if isinstance(parsed, dict):
+            return parsed
+        failures.append(f"{label}: top-level type is {type(parsed).__name__}, expected object")
+        return None
 
-    def _close_truncated_json(candidate: str) -> str:
+    def _close_truncated_json(candidate: str, state: tuple[int, int, bool] | None = None) -> str:
         """Best-effort close for truncated JSON text (local model length cutoffs)."""
         s = (candidate or "").strip()
         if not s:
             return s
-
-        brace_depth = 0
-        in_string = False
-        escaped = False
-
-        for ch in s:
-            if escaped:
-                escaped = False
-                continue
-            if ch == "\\" and in_string:
-                escaped = True
-                continue
-            if ch == '"':
-                in_string = not in_string
-                continue
-            if in_string:
-                continue
-            if ch == "{":
-                brace_depth += 1
-            elif ch == "}":
-                brace_depth = max(0, brace_depth - 1)
-
+        _, brace_depth, in_string = state if state is not None else _scan_json_state(s)
         repaired = s
         if in_string:
             repaired += '"'
@@ -157,151 +682,306 @@ def _extract_json(text: str) -> dict | None:
             repaired += "}" * brace_depth
         return repaired
 
-    # Strategy 1: Try direct parse (ideal case)
-    parsed = _try_parse(raw)
+    # Strategy 1: Repair the whole text (a direct parse can only succeed on the fast path)
+    parsed = _try_parse("repaired", raw, direct=False)
     if parsed is not None:
-        return parsed
+        return parsed, ""
 
     # Strategy 1b: Recover from truncated tail (e.g. finish_reason=length)
-    parsed = _try_parse(_close_truncated_json(raw))
-    if parsed is not None:
-        return parsed
+    raw_state = _scan_json_state(raw)
+    closed = _close_truncated_json(raw, raw_state)
+    if closed != raw:
+        parsed = _try_parse("autoclose", closed)
+        if parsed is not None:
+            return parsed, ""
 
     # Strategy 2: Extract from markdown ```json ... ``` blocks
-    md_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', raw, re.DOTALL)
+    md_match = _MD_BLOCK_RE.search(raw)
     if md_match:
-        parsed = _try_parse(md_match.group(1).strip())
+        parsed = _try_parse("fenced", md_match.group(1).strip())
         if parsed is not None:
-            return parsed
+            return parsed, ""
 
     # Strategy 2b: Unclosed markdown fence (common in truncated local outputs)
-    md_unclosed = re.search(r'```(?:json)?\s*\n?(.*)$', raw, re.DOTALL)
+    md_unclosed = _MD_UNCLOSED_RE.search(raw)
     if md_unclosed:
         candidate = md_unclosed.group(1).replace("```", "").strip()
-        parsed = _try_parse(candidate)
+        parsed = _try_parse("unclosed_fence", candidate)
         if parsed is not None:
-            return parsed
+            return parsed, ""
 
     # Strategy 3: Find the first { ... } block using brace matching
     brace_start = raw.find('{')
-    if brace_start != -1:
-        depth = 0
-        for i in range(brace_start, len(raw)):
-            if raw[i] == '{':
-                depth += 1
-            elif raw[i] == '}':
-                depth -= 1
-                if depth == 0:
-                    candidate = raw[brace_start:i + 1]
-                    parsed = _try_parse(candidate)
-                    if parsed is not None:
-                        return parsed
-                    break
-
-        # Strategy 3b: If text is truncated and only missing closing braces, try autoclose
+    if brace_start == -1:
+        failures.append("no '{' in response")
+    else:
         tail = raw[brace_start:]
-        depth = 0
-        for ch in tail:
-            if ch == "{":
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-        if depth > 0:
-            repaired = tail + ("}" * depth)
-            parsed = _try_parse(repaired)
+        tail_state = raw_state if brace_start == 0 else _scan_json_state(tail)
+        balanced_end = tail_state[0]
+        first_object = tail[:balanced_end + 1] if balanced_end != -1 else ""
+        # Skip when the first object is the whole text: Strategy 1 already tried it.
+        if first_object and first_object != raw:
+            parsed = _try_parse("first_object", first_object)
             if parsed is not None:
-                return parsed
-
-        # Strategy 3c: Truncated mid-string/mid-object (unclosed quote + missing braces)
-        parsed = _try_parse(_close_truncated_json(tail))
-        if parsed is not None:
-            return parsed
-
-    return None
-
-
-def _json_error_message(exc: json.JSONDecodeError) -> str:
-    return f"{exc.msg} at line {exc.lineno}, column {exc.colno} (char {exc.pos})"
+                return parsed, ""
 
+        # Strategy 3b: Truncated mid-string/mid-object (unclosed quote + missing braces);
+        # with brace_start == 0 this is the same candidate Strategy 1b already tried.
+        if brace_start > 0:
+            parsed = _try_parse("tail_autoclose", _close_truncated_json(tail, tail_state))
+            if parsed is not None:
+                return parsed, ""
 
-def _diagnose_json_parse_error(text: str) -> str:
-    """Return best-effort JSON parse diagnostics with line/column."""
-    raw = (text or "").strip()
-    if not raw:
-        return "empty response text"
-
-    candidates: list[tuple[str, str]] = [("raw", raw)]
-
-    repaired = raw.replace("“", '"').replace("”", '"').replace("’", "'")
-    repaired = repaired.replace("\ufeff", "")
-    repaired = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F]', "", repaired)
-    repaired = re.sub(r",\s*([}\]])", r"\1", repaired)
-    if repaired != raw:
-        candidates.append(("repaired", repaired))
-
-    brace_start = raw.find("{")
-    if brace_start != -1:
-        tail = raw[brace_start:]
-        depth = 0
-        in_string = False
-        escaped = False
-        for ch in tail:
-            if escaped:
-                escaped = False
-                continue
-            if ch == "\\" and in_string:
-                escaped = True
-                continue
-            if ch == '"':
-                in_string = not in_string
-                continue
-            if in_string:
-                continue
-            if ch == "{":
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-        tail_closed = tail + ("}" * max(0, depth))
-        if tail_closed != tail:
-            candidates.append(("tail_autoclose", tail_closed))
-
-    errors: list[str] = []
-    for label, candidate in candidates:
-        try:
-            parsed = json.loads(candidate)
-            if isinstance(parsed, dict):
-                return f"{label}: parseable JSON object (extractor likely failed on formatting path)"
-            return f"{label}: parsed JSON but top-level type is {type(parsed).__name__}, expected object"
-        except json.JSONDecodeError as exc:
-            errors.append(f"{label}: {_json_error_message(exc)}")
+    return None, " | ".join(failures) if failures else "unknown parse failure"
 
-    return " | ".join(errors) if errors else "unknown parse failure"
 
+ANALYSIS_FIELDS = (
+    "category_tag",
+    "title_en",
+    "title_de",
+    "summary_en",
+    "summary_de",
+    "german_context",
+    "tool_stack",
+    "simple_explanation",
+    "technician_analysis_de",
+)
+ANALYSIS_JSON_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {name: {"type": "string"} for name in ANALYSIS_FIELDS},
+    "required": list(ANALYSIS_FIELDS),
+    "additionalProperties": False,
+}
+_QUOTED_FIELDS = ",".join(f'"{name}"' for name in ANALYSIS_FIELDS)
+
+
+@functools.lru_cache(maxsize=8)
+def _batch_json_schema(size: int) -> dict[str, Any]:
+    """Schema for a packed batch reply: {"articles": [size x (id + analysis fields)]}."""
+    item = {
+        "type": "object",
+        "properties": {"id": {"type": "integer"}, **ANALYSIS_JSON_SCHEMA["properties"]},
+        "required": ["id", *ANALYSIS_FIELDS],
+        "additionalProperties": False,
+    }
+    return {
+        "type": "object",
+        "properties": {
+            "articles": {"type": "array", "items": item, "minItems": size, "maxItems": size}
+        },
+        "required": ["articles"],
+        "additionalProperties": False,
+    }
 
 # Prompt design:
 # - STUDENT_EN_PROMPT: concise English brief for student-facing outputs
 # - TECHNICIAN_DE_PROMPT: concise German brief for technician-facing outputs
 # Both keep the key constraints from the original long Chinese prompt.
-STUDENT_EN_PROMPT = (
-    "Extract key info into a JSON object with strictly these keys: "
-    '"category_tag","title_en","title_de","summary_en","summary_de",'
-    '"german_context","tool_stack","simple_explanation","technician_analysis_de". '
+_STUDENT_EN_RULES = (
     "Return ONLY valid JSON. No markdown. No reasoning. No tags like <think>. "
     "Use predefined tags (factory, robotics, automotive, supply chain, energy, cybersecurity) for category_tag. "
     "Write 2 clear Chinese sentences for simple_explanation. "
     "german_context and technician_analysis_de MUST be strictly in German. "
     "Fill other fields concisely based on the content. Use empty strings if uncertain."
 )
+STUDENT_EN_PROMPT = (
+    f"Extract key info into a JSON object with strictly these keys: {_QUOTED_FIELDS}. "
+    + _STUDENT_EN_RULES
+)
+# Packed multi-article variant of STUDENT_EN_PROMPT (see _analyze_batch).
+BATCH_PROMPT = (
+    'The input is a JSON array of articles. Return {"articles": [...]} with one object per '
+    'input article, in input order, each holding the article\'s integer "id" and strictly '
+    f"these keys: {_QUOTED_FIELDS}. " + _STUDENT_EN_RULES
+)
 TECHNICIAN_DE_PROMPT = (
-    "Erstelle ein reines JSON-Objekt mit exakt diesen Schlüsseln: "
-    '"category_tag","title_en","title_de","summary_en","summary_de",'
-    '"german_context","tool_stack","simple_explanation","technician_analysis_de". '
+    f"Erstelle ein reines JSON-Objekt mit exakt diesen Schlüsseln: {_QUOTED_FIELDS}. "
     "Nur gültiges JSON ausgeben. Kein Markdown. Keine Erklärungen. Keine <think> Tags. "
     "Zielgruppe für technician_analysis_de: Ein durchschnittlicher Facharbeiter in der Maschinenbauindustrie. "
     "german_context: Kurzer industrieller Kontext (Deutsch). "
     "technician_analysis_de: Kurze technische Analyse und nächster Schritt (Deutsch). MUSS sehr einfach und allgemein verständlich sein, ohne Fachjargon. "
     "Einfache, direkte Sprache."
 )
+MINIMAL_PROMPT = (
+    'Return ONLY valid JSON. No markdown. No explanation. '
+    f'Required keys: {",".join(ANALYSIS_FIELDS)}. '
+    'Use empty string if unknown. '
+    'simple_explanation must be exactly 2 Chinese sentences. '
+    'german_context and technician_analysis_de should be concise German operational points.'
+)
+# Leading line of every user message; keeping it ahead of the article fields
+# extends the prefix that Ollama/provider prompt caches can reuse.
+USER_JSON_REMINDER = "请只输出JSON。"
+SHORT_JSON_REMINDER = "reply with JSON only."
+# Reminder, title, source and URL around the snippet in a local user message.
+_LOCAL_USER_OVERHEAD_CHARS = 600
+
+
+def _local_num_ctx() -> int:
+    """
+    One Ollama context window for every local request, in 1024-token steps up to
+    LOCAL_NUM_CTX_MAX: the longest prompt, a full-length user message and MAX_TOKENS of
+    output (the adaptive budget never exceeds it). Fixed per process, because a changed
+    num_ctx makes Ollama reload the model.
+    """
+    longest_prompt = max(len(STUDENT_EN_PROMPT), len(TECHNICIAN_DE_PROMPT), len(MINIMAL_PROMPT))
+    user_chars = _SNIPPET_BOUND + _LOCAL_USER_OVERHEAD_CHARS
+    needed = (longest_prompt + user_chars) // 3 + MAX_TOKENS + 128
+    return min(LOCAL_NUM_CTX_MAX, max(1024, -(-needed // 1024) * 1024))
+
+
+LOCAL_NUM_CTX = _local_num_ctx()
+
+
+def _record_primary_outcome(source: str, ok: bool) -> None:
+    with _source_stats_lock:
+        _source_attempts[source] += 1
+        if not ok:
+            _source_failures[source] += 1
+
+
+def _should_speculate(source: str) -> bool:
+    """Race attempts only for cloud sources whose first attempt has failed often enough."""
+    if not SPECULATIVE_RETRY or IS_LOCAL:
+        return False
+    if not STREAM_RESPONSES and not SPECULATIVE_NON_STREAMED:
+        return False
+    with _source_stats_lock:
+        attempts = _source_attempts[source]
+        failures = _source_failures[source]
+    return attempts >= SPECULATIVE_MIN_SAMPLES and failures / attempts >= SPECULATIVE_FAILURE_RATE
+
+
+def _get_speculative_executor() -> ThreadPoolExecutor:
+    global _speculative_executor
+    if _speculative_executor is None:
+        _speculative_executor = ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENCY * 2, thread_name_prefix="llm-speculative"
+        )
+        # Shared by every race; queued legs are dropped at exit instead of starting late.
+        atexit.register(_speculative_executor.shutdown, wait=False, cancel_futures=True)
+    return _speculative_executor
+
+
+def _race_attempts(
+    client: OpenAI, source: str, primary: tuple[str, str], fallback: tuple[str, str]
+) -> dict | None:
+    """
+    Issue primary and fallback (system_prompt, user_content) attempts together and return
+    the first parsed payload. The loser is signalled to stop: a streamed call aborts, and a
+    non-streamed one (only raced with LLM_SPECULATIVE_NON_STREAMED) runs to completion in
+    the background and its result is discarded.
+    """
+    cancel = threading.Event()
+    executor = _get_speculative_executor()
+    primary_future = executor.submit(_call_and_parse, client, *primary, cancel=cancel)
+    fallback_future = executor.submit(_call_and_parse, client, *fallback, cancel=cancel)
+
+    def _on_primary_done(future: Future) -> None:
+        result = future.result() if future.exception() is None else None
+        if result is not None:
+            _record_primary_outcome(source, True)
+        elif not cancel.is_set():
+            _record_primary_outcome(source, False)
+
+    primary_future.add_done_callback(_on_primary_done)
+
+    data: dict | None = None
+    pending = {primary_future, fallback_future}
+    while pending and data is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None and future.result() is not None:
+                data = future.result()
+                break
+    cancel.set()
+    return data
+
+
+def _analysis_cache_key(article: Article) -> str:
+    """Hash of exactly what the model sees: URL plus the snippet slice sent."""
+    payload = f"{article.url}|{article.content_snippet[:PRIMARY_SNIPPET_LIMIT]}".encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _result_cache_version() -> str:
+    """
+    Provider, model and prompt texts the cached analyses were produced with. A persisted
+    cache written under another version is discarded instead of serving stale results.
+    """
+    prompts = "\n".join([STUDENT_EN_PROMPT, TECHNICIAN_DE_PROMPT, BATCH_PROMPT, MINIMAL_PROMPT])
+    return f"{API_PROVIDER}|{LLM_MODEL}|{_prompt_cache_key(prompts)}"
+
+
+def _cached_analysis(article: Article) -> AnalyzedArticle | None:
+    key = _analysis_cache_key(article)
+    with _result_cache_lock:
+        data = _result_cache.pop(key, None)
+        if data is None:
+            return None
+        # Re-insert as most recently used; pruning drops from the front.
+        _result_cache[key] = data
+    logger.info(f"[{API_PROVIDER}] Cache hit for '{article.title[:40]}'")
+    return _build_analyzed(article, data)
+
+
+def _remember_analysis(article: Article, data: dict) -> None:
+    fields = {key: data[key] for key in ANALYSIS_FIELDS if key in data}
+    key = _analysis_cache_key(article)
+    with _result_cache_lock:
+        _result_cache.pop(key, None)
+        _result_cache[key] = fields
+        while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+            del _result_cache[next(iter(_result_cache))]
+
+
+def _load_result_cache() -> None:
+    """Read the persisted cache once per process; a missing or corrupt file starts empty."""
+    global _result_cache_loaded
+    if _result_cache_loaded or not RESULT_CACHE_PATH:
+        return
+    _result_cache_loaded = True
+    try:
+        with open(RESULT_CACHE_PATH, "rb") as f:
+            stored = json_loads(f.read())
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.warning(f"[{API_PROVIDER}] Ignoring unreadable result cache {RESULT_CACHE_PATH}: {e}")
+        return
+    if not isinstance(stored, dict) or stored.get("version") != _result_cache_version():
+        logger.info(
+            f"[{API_PROVIDER}] Result cache was written for another model/prompt; starting empty"
+        )
+        return
+    entries = stored.get("entries")
+    if not isinstance(entries, dict):
+        return
+    with _result_cache_lock:
+        # Entries already cached this run are newer; loaded ones go in front of them.
+        current = dict(_result_cache)
+        _result_cache.clear()
+        for key, value in list(entries.items())[-RESULT_CACHE_MAX_ENTRIES:]:
+            if isinstance(value, dict):
+                _result_cache[key] = value
+        _result_cache.update(current)
+        while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+            del _result_cache[next(iter(_result_cache))]
+
+
+def _save_result_cache() -> None:
+    if not RESULT_CACHE_PATH:
+        return
+    with _result_cache_lock:
+        snapshot = {"version": _result_cache_version(), "entries": dict(_result_cache)}
+    tmp_path = f"{RESULT_CACHE_PATH}.tmp"
+    try:
+        os.makedirs(os.path.dirname(RESULT_CACHE_PATH) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, RESULT_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"[{API_PROVIDER}] Could not persist result cache: {e}")
 
 
 def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | None:
@@ -328,15 +1008,26 @@ def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | N
             original=article,
         )
 
+    cached = _cached_analysis(article)
+    if cached is not None:
+        return cached
+    return _analyze_uncached(article)
+
+
+def _analyze_uncached(article: Article) -> AnalyzedArticle | None:
+    """LLM analysis of one article; the caller has already checked the result cache."""
     client = _get_client()
+    # One bounded copy of the snippet; every prompt variant below slices this short string.
+    snippet = article.content_snippet[:_SNIPPET_BOUND]
 
-    snippet_limit = LOCAL_SNIPPET_LIMIT if IS_LOCAL else 800
+    # Constant instruction first, article fields last: the cacheable prefix
+    # (system prompt + reminder) stays byte-identical across articles.
     user_content = (
+        f"{USER_JSON_REMINDER}\n\n"
         f"标题: {article.title}\n"
         f"来源: {article.source}\n"
         f"链接: {article.url}\n"
-        f"内容片段:\n{article.content_snippet[:snippet_limit]}\n\n"
-        f"请只输出JSON。"
+        f"内容片段:\n{snippet[:PRIMARY_SNIPPET_LIMIT]}"
     )
 
     def _needs_technician_enhance(payload: dict | None) -> bool:
@@ -344,7 +1035,14 @@ def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | N
             return True
         german_context = str(payload.get("german_context", "") or "").strip()
         technician_de = str(payload.get("technician_analysis_de", "") or "").strip()
-        return len(german_context) < 24 or len(technician_de) < 24
+        short_field = min(len(german_context), len(technician_de)) < LOCAL_DE_MIN_CHARS
+        # One short field is tolerated when the two together carry enough German text.
+        needs = short_field and len(german_context) + len(technician_de) < 2 * LOCAL_DE_MIN_CHARS
+        logger.info(
+            f"[{API_PROVIDER}] DE fields {len(german_context)}/{len(technician_de)} chars: "
+            f"{'technician enhance' if needs else 'enhance skipped'}"
+        )
+        return needs
 
     def _merge_payload(base: dict | None, patch: dict | None) -> dict | None:
         if base is None:
@@ -370,19 +1068,28 @@ def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | N
             tech_data = _call_and_parse(client, TECHNICIAN_DE_PROMPT, user_content)
         data = _merge_payload(student_data, tech_data)
     else:
-        data = _call_and_parse(client, STUDENT_EN_PROMPT, user_content)
-
-    # Cloud fallback: simplified schema + shorter input can recover empty/non-JSON responses.
-    if data is None and not IS_LOCAL:
-        logger.warning(f"[{API_PROVIDER}] Retry with student prompt for '{article.title[:40]}'")
+        # Cloud fallback: simplified schema + shorter input can recover empty/non-JSON responses.
         short_user_content = (
+            f"{SHORT_JSON_REMINDER}\n"
             f"title: {article.title[:180]}\n"
             f"source: {article.source}\n"
             f"url: {article.url}\n"
-            f"snippet: {article.content_snippet[:350]}\n"
-            f"reply with JSON only."
+            f"snippet: {snippet[:350]}"
         )
-        data = _call_and_parse(client, STUDENT_EN_PROMPT, short_user_content)
+        if _should_speculate(article.source):
+            logger.info(f"[{API_PROVIDER}] Racing primary and fallback prompts for '{article.title[:40]}'")
+            data = _race_attempts(
+                client,
+                article.source,
+                (STUDENT_EN_PROMPT, user_content),
+                (STUDENT_EN_PROMPT, short_user_content),
+            )
+        else:
+            data = _call_and_parse(client, STUDENT_EN_PROMPT, user_content)
+            _record_primary_outcome(article.source, data is not None)
+            if data is None:
+                logger.warning(f"[{API_PROVIDER}] Retry with student prompt for '{article.title[:40]}'")
+                data = _call_and_parse(client, STUDENT_EN_PROMPT, short_user_content)
 
     # --- Attempt 3: Retry with strict minimal schema + shorter input (尝试 3: 最小化输入重试) ---
     if data is None and IS_LOCAL:
@@ -391,27 +1098,21 @@ def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | N
             f"title: {article.title[:180]}\n"
             f"source: {article.source}\n"
             f"url: {article.url}\n"
-            f"snippet: {article.content_snippet[:LOCAL_RETRY_SNIPPET_LIMIT]}\n"
+            f"snippet: {snippet[:LOCAL_RETRY_SNIPPET_LIMIT]}\n"
         )
-        minimal_prompt = (
-            'Return ONLY valid JSON. No markdown. No explanation. '
-            'Required keys: category_tag,title_en,title_de,summary_en,summary_de,'
-            'german_context,tool_stack,simple_explanation,technician_analysis_de. '
-            'Use empty string if unknown. '
-            'simple_explanation must be exactly 2 Chinese sentences. '
-            'german_context and technician_analysis_de should be concise German operational points.'
+        data = _call_and_parse(
+            client, MINIMAL_PROMPT, minimal_user_content, max_tokens=MINIMAL_RETRY_MAX_TOKENS
         )
-        data = _call_and_parse(client, minimal_prompt, minimal_user_content)
 
     # Optional final retry for local model. Disabled by default to prevent timeout storms.
     if data is None and IS_LOCAL and LOCAL_ENABLE_FINAL_RETRY:
         logger.warning(f"[{API_PROVIDER}] Final retry with technician prompt for '{article.title[:40]}'")
         final_retry_content = (
+            f"{SHORT_JSON_REMINDER}\n"
             f"title: {article.title[:140]}\n"
             f"source: {article.source}\n"
             f"url: {article.url}\n"
-            f"snippet: {article.content_snippet[:180]}\n"
-            "reply with JSON only."
+            f"snippet: {snippet[:180]}"
         )
         data = _call_and_parse(client, TECHNICIAN_DE_PROMPT, final_retry_content)
 
@@ -421,23 +1122,41 @@ def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | N
         # 上游会尝试从尚未分析的候选中补位。
         return None
 
-    # Helper to force string type
-    def _ensure_str(value: Any) -> str:
-        if value is None:
-            return ""
-        if isinstance(value, str):
-            return value
-        if isinstance(value, list):
-            # Join list items with space or comma
-            return " ".join(str(v) for v in value)
-        if isinstance(value, dict):
-            # Fallback for dict (should stay rare): dump as string
-            return json.dumps(value, ensure_ascii=False)
-        return str(value)
-
-    # Construct AnalyzedArticle from JSON data
-    # creating AnalyzedArticle with sanitized inputs
-    analyzed = AnalyzedArticle(
+    _remember_analysis(article, data)
+    analyzed = _build_analyzed(article, data)
+    logger.info(f"[{API_PROVIDER}] ✅ Analyzed: [{analyzed.category_tag}] {analyzed.title_en[:50]}")
+    return analyzed
+
+
+_SPACE_JOIN = " ".join
+
+
+def _ensure_str(value: Any) -> str:
+    """Force a model-provided field value to string."""
+    # Exact-type check first: nearly every field is already a plain str.
+    if value.__class__ is str:
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        # Join list items with space or comma
+        return _SPACE_JOIN(str(v) for v in value)
+    if isinstance(value, dict):
+        # Fallback for dict (should stay rare): dump as string
+        if orjson_dumps is not None:
+            try:
+                return orjson_dumps(value).decode()
+            except TypeError:
+                pass  # e.g. non-str keys; stdlib json coerces them
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _build_analyzed(article: Article, data: dict) -> AnalyzedArticle:
+    """Construct AnalyzedArticle from parsed JSON with sanitized inputs."""
+    return AnalyzedArticle(
         category_tag=_ensure_str(data.get("category_tag", "Other")),
         title_en=_ensure_str(data.get("title_en", article.title)),
         title_de=_ensure_str(data.get("title_de", article.title)),
@@ -453,132 +1172,254 @@ def analyze_article(article: Article, mock: bool = False) -> AnalyzedArticle | N
         original=article,
     )
 
-    logger.info(f"[{API_PROVIDER}] ✅ Analyzed: [{analyzed.category_tag}] {analyzed.title_en[:50]}")
-    return analyzed
-
 
-def _call_and_parse(client: OpenAI, system_prompt: str, user_content: str) -> dict | None:
-    """Call the model and attempt to parse JSON from the response."""
-    def _message_debug_snapshot(message: object) -> str:
-        """Compact structural snapshot for empty-response diagnosis."""
+def _analyze_batch(articles: list[Article]) -> list[AnalyzedArticle | None]:
+    """
+    Analyze several articles in one call (prompt packing) to share the system-prompt prefill.
+    Returns results aligned with the input; None marks articles missing from the reply.
+    """
+    client = _get_client()
+    items = [
+        {
+            "id": idx,
+            "title": article.title,
+            "source": article.source,
+            "url": article.url,
+            "snippet": article.content_snippet[:PRIMARY_SNIPPET_LIMIT],
+        }
+        for idx, article in enumerate(articles)
+    ]
+    user_content = (
+        f"Articles:\n{json.dumps(items, ensure_ascii=False)}\n\n"
+        f"Return a JSON object with one entry per article ({len(articles)}) in the same order."
+    )
+    data = _call_and_parse(
+        client,
+        BATCH_PROMPT,
+        user_content,
+        max_tokens=MAX_TOKENS * len(articles),
+        schema=_batch_json_schema(len(articles)),
+    )
+    entries = data.get("articles") if data else None
+    if not isinstance(entries, list):
+        logger.warning(f"[{API_PROVIDER}] Batch of {len(articles)} returned no article list")
+        return [None] * len(articles)
+
+    by_id: dict[int, dict] = {}
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
         try:
-            model_dump = getattr(message, "model_dump", None)
-            if callable(model_dump):
-                dumped = model_dump()
-                content = dumped.get("content")
-                content_type = type(content).__name__
-                content_len = len(content) if isinstance(content, (list, str)) else 0
-                keys = sorted(list(dumped.keys()))
-                return (
-                    f"keys={keys}; content_type={content_type}; content_len={content_len}; "
-                    f"tool_calls={bool(dumped.get('tool_calls'))}; refusal={bool(dumped.get('refusal'))}"
-                )
-        except Exception:
-            pass
+            entry_id = int(entry.get("id", position))
+        except (TypeError, ValueError):
+            entry_id = position
+        by_id.setdefault(entry_id, entry)
+
+    results: list[AnalyzedArticle | None] = []
+    for idx, article in enumerate(articles):
+        entry = by_id.get(idx)
+        if entry:
+            _remember_analysis(article, entry)
+        results.append(_build_analyzed(article, entry) if entry else None)
+    logger.info(
+        f"[{API_PROVIDER}] ✅ Batch analyzed {sum(r is not None for r in results)}/{len(articles)}"
+    )
+    return results
 
-        content = getattr(message, "content", None)
-        return (
-            f"fallback content_type={type(content).__name__}; "
-            f"tool_calls={bool(getattr(message, 'tool_calls', None))}; "
-            f"refusal={bool(getattr(message, 'refusal', None))}"
-        )
 
-    def _message_to_text(message: object) -> str:
-        content = getattr(message, "content", None)
-        if isinstance(content, str):
-            return content
-        if isinstance(content, list):
-            parts: list[str] = []
-            for item in content:
-                if isinstance(item, str):
-                    parts.append(item)
-                elif isinstance(item, dict):
-                    text = item.get("text") or item.get("content")
-                    if isinstance(text, str):
-                        parts.append(text)
-                else:
-                    # OpenAI/Ollama compat may return typed content-part objects.
-                    text = getattr(item, "text", None) or getattr(item, "content", None)
-                    if isinstance(text, str):
-                        parts.append(text)
-                    elif isinstance(text, list):
-                        for sub in text:
-                            if isinstance(sub, str):
-                                parts.append(sub)
-                            elif isinstance(sub, dict):
-                                sub_text = sub.get("text") or sub.get("content")
-                                if isinstance(sub_text, str):
-                                    parts.append(sub_text)
-            return "\n".join([p for p in parts if p]).strip()
-
-        # Some providers put text in non-standard fields.
-        for attr in ("reasoning_content", "refusal"):
-            value = getattr(message, attr, None)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-        return ""
+def _analyze_chunk(articles: list[Article], mock: bool) -> list[AnalyzedArticle | None]:
+    """Worker unit: one article, or a packed batch with per-article fallback for gaps."""
+    if mock:
+        return [analyze_article(article, mock) for article in articles]
+    results = [_cached_analysis(article) for article in articles]
+    pending = [idx for idx, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+    # Gate on the adaptive cap; the executor size is only the upper bound.
+    _concurrency.acquire()
+    try:
+        # Cache misses only: the lookup above already covered every article in the chunk.
+        if len(pending) == 1:
+            results[pending[0]] = _analyze_uncached(articles[pending[0]])
+            return results
+        batch_results = _analyze_batch([articles[idx] for idx in pending])
+        for idx, result in zip(pending, batch_results, strict=True):
+            results[idx] = result if result is not None else _analyze_uncached(articles[idx])
+        return results
+    finally:
+        _concurrency.release()
+
+
+def _message_debug_snapshot(message: object) -> str:
+    """Compact structural snapshot for empty-response diagnosis."""
+    try:
+        model_dump = getattr(message, "model_dump", None)
+        if callable(model_dump):
+            dumped = model_dump()
+            content = dumped.get("content")
+            content_type = type(content).__name__
+            content_len = len(content) if isinstance(content, (list, str)) else 0
+            keys = sorted(list(dumped.keys()))
+            return (
+                f"keys={keys}; content_type={content_type}; content_len={content_len}; "
+                f"tool_calls={bool(dumped.get('tool_calls'))}; refusal={bool(dumped.get('refusal'))}"
+            )
+    except Exception:
+        pass
+
+    content = getattr(message, "content", None)
+    return (
+        f"fallback content_type={type(content).__name__}; "
+        f"tool_calls={bool(getattr(message, 'tool_calls', None))}; "
+        f"refusal={bool(getattr(message, 'refusal', None))}"
+    )
+
+
+def _message_to_text(message: object) -> str:
+    """Message text, stripped. OpenAI-compatible providers return str content."""
+    content = getattr(message, "content", None)
+    if content.__class__ is str:
+        return content.strip()
+    return _message_to_text_slow(message, content)
+
+
+def _message_to_text_slow(message: object, content: Any) -> str:
+    """Content-part lists and non-standard fields from less common providers."""
+    if isinstance(content, str):
+        return content.strip()
+    if isinstance(content, list):
+        parts: list[str] = []
+        for item in content:
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, dict):
+                text = item.get("text") or item.get("content")
+                if isinstance(text, str):
+                    parts.append(text)
+            else:
+                # OpenAI/Ollama compat may return typed content-part objects.
+                text = getattr(item, "text", None) or getattr(item, "content", None)
+                if isinstance(text, str):
+                    parts.append(text)
+                elif isinstance(text, list):
+                    for sub in text:
+                        if isinstance(sub, str):
+                            parts.append(sub)
+                        elif isinstance(sub, dict):
+                            sub_text = sub.get("text") or sub.get("content")
+                            if isinstance(sub_text, str):
+                                parts.append(sub_text)
+        return "\n".join([p for p in parts if p]).strip()
+
+    # Some providers put text in non-standard fields.
+    for attr in ("reasoning_content", "refusal"):
+        value = getattr(message, attr, None)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+@contextlib.contextmanager
+def _single_flight_if_throttled():
+    """Serialize API calls while rate-limited so workers do not compound 429s."""
+    if not _throttled.is_set():
+        yield
+        return
+    with _throttled_gate:
+        yield
+
+
+def _call_and_parse(
+    client: OpenAI,
+    system_prompt: str,
+    user_content: str,
+    max_tokens: int | None = None,
+    cancel: threading.Event | None = None,
+    schema: dict[str, Any] = ANALYSIS_JSON_SCHEMA,
+) -> dict | None:
+    """
+    Call the model and attempt to parse JSON from the response.
+    max_tokens overrides the adaptive budget; such calls are not recorded in the window.
+    cancel (speculative attempts) skips the call or aborts the stream once set.
+    schema is the structured-output schema used when decoding is constrained.
+    """
+    # Request arguments are identical across rate-limit retries; build them once.
+    temperature = 0.0 if IS_LOCAL else 0.2
+    request_max_tokens = max_tokens if max_tokens is not None else _current_max_tokens()
+    request_kwargs: dict[str, Any] = {
+        "model": LLM_MODEL,
+        "messages": [_system_message(system_prompt), {"role": "user", "content": user_content}],
+        "temperature": temperature,
+        "max_tokens": request_max_tokens,
+        "timeout": REQUEST_TIMEOUT_SECONDS,
+        "stream": STREAM_RESPONSES,
+    }
+    # Rough chars-per-token estimate for the TPM quota.
+    est_tokens = (len(system_prompt) + len(user_content)) // 3 + request_max_tokens
+    if IS_LOCAL:
+        # Explicitly set num_predict/context for local models.
+        request_kwargs["extra_body"] = {
+            "format": schema if LOCAL_SCHEMA_FORMAT else "json",
+            "options": {
+                "num_predict": request_max_tokens,
+                "num_ctx": LOCAL_NUM_CTX,
+                "temperature": temperature,
+            },
+        }
+    else:
+        if PROMPT_CACHE_ENABLED:
+            request_kwargs["extra_body"] = _prompt_cache_body(system_prompt)
+        if CLOUD_JSON_SCHEMA:
+            request_kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "analyzed_article", "schema": schema, "strict": True},
+            }
 
     for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
         try:
-            global _last_request_ts
-            # Global throttle to reduce provider-side 429 for cloud endpoints.
-            with _rate_lock:
-                now = time.monotonic()
-                wait_s = MIN_REQUEST_INTERVAL_SECONDS - (now - _last_request_ts)
-                if wait_s > 0:
-                    time.sleep(wait_s)
-                _last_request_ts = time.monotonic()
-
-            messages_payload: Any = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content},
-            ]
-            temperature = 0.0 if IS_LOCAL else 0.2
-            if IS_LOCAL:
-                response = client.chat.completions.create(
-                    model=LLM_MODEL,
-                    messages=messages_payload,
-                    temperature=temperature,
-                    max_tokens=MAX_TOKENS,
-                    timeout=REQUEST_TIMEOUT_SECONDS,
-                    # Explicitly set num_predict/context for local models.
-                    extra_body={
-                        "format": "json",
-                        "options": {
-                            "num_predict": MAX_TOKENS,
-                            "num_ctx": 4096,
-                            "temperature": temperature,
-                        },
-                    },
-                )
+            # Shared RPM/TPM window to reduce provider-side 429 for cloud endpoints.
+            _limiter.acquire(est_tokens)
+            if cancel is not None and cancel.is_set():
+                return None
+
+            call_started = time.monotonic()
+            with _single_flight_if_throttled():
+                raw_response = client.chat.completions.with_raw_response.create(**request_kwargs)
+                _throttled.clear()
+            _limiter.observe_headers(raw_response.headers)
+            response = raw_response.parse()
+
+            completion_tokens: int | None = None
+            if STREAM_RESPONSES:
+                raw, finish_reason, completion_tokens = _consume_stream(response, cancel)
+                if finish_reason == "cancelled":
+                    return None
             else:
-                response = client.chat.completions.create(
-                    model=LLM_MODEL,
-                    messages=messages_payload,
-                    temperature=temperature,
-                    max_tokens=MAX_TOKENS,
-                    timeout=REQUEST_TIMEOUT_SECONDS,
+                choice = response.choices[0]
+                raw = _message_to_text(choice.message)
+                finish_reason = getattr(choice, "finish_reason", "unknown")
+                completion_tokens = getattr(
+                    getattr(response, "usage", None), "completion_tokens", None
                 )
+            _concurrency.on_success(time.monotonic() - call_started)
+            if max_tokens is None:
+                _record_completion_tokens(completion_tokens, finish_reason)
 
-            raw = _message_to_text(response.choices[0].message)
             if not raw:
-                finish_reason = getattr(response.choices[0], "finish_reason", "unknown")
                 logger.warning(f"[{API_PROVIDER}] Empty response from model (finish_reason={finish_reason})")
-                logger.warning(
-                    f"[{API_PROVIDER}] Empty-response message snapshot: "
-                    f"{_message_debug_snapshot(response.choices[0].message)}"
-                )
+                if STREAM_RESPONSES:
+                    snapshot = f"stream content_chunks={completion_tokens}"
+                else:
+                    snapshot = _message_debug_snapshot(choice.message)
+                logger.warning(f"[{API_PROVIDER}] Empty-response message snapshot: {snapshot}")
                 return None
 
-            raw = raw.strip()
             preview = raw[:300]
             suffix = "..." if len(raw) > 300 else ""
             logger.info(f"[{API_PROVIDER}] Raw response ({len(raw)} chars): {preview}{suffix}")
 
-            data = _extract_json(raw)
+            data, parse_error = _extract_json_with_reason(raw)
             if data is None:
-                finish_reason = getattr(response.choices[0], "finish_reason", "unknown")
-                parse_error = _diagnose_json_parse_error(raw)
                 logger.warning(
                     f"[{API_PROVIDER}] Could not extract JSON from response "
                     f"(finish_reason={finish_reason}; parse_error={parse_error})"
@@ -587,22 +1428,46 @@ def _call_and_parse(client: OpenAI, system_prompt: str, user_content: str) -> di
 
             return data
 
-        except Exception as e:
-            msg = str(e).lower()
-            if "429" in msg or "too many requests" in msg:
+        except APITimeoutError:
+            # The client closed the socket at REQUEST_TIMEOUT_SECONDS; the worker is free again.
+            _concurrency.decrease()
+            logger.warning(
+                f"[{API_PROVIDER}] Request timed out after {REQUEST_TIMEOUT_SECONDS:.0f}s"
+            )
+            return None
+        except APIStatusError as e:
+            # RateLimitError is the 429 subclass; Ollama also answers 429 for
+            # "too many concurrent requests".
+            rate_limited = e.status_code == 429
+            # The concurrency-limit message can also arrive under a non-429 status; match the text too.
+            overloaded = rate_limited or "too many concurrent requests" in str(e).lower()
+            if rate_limited or e.status_code >= 500:
+                _concurrency.decrease()
+            if overloaded:
+                _throttled.set()
+            if rate_limited:
                 if attempt < MAX_RATE_LIMIT_RETRIES:
-                    backoff = RATE_LIMIT_BACKOFF_SECONDS * (2 ** attempt)
+                    retry_after = _retry_after_seconds(e.response.headers)
+                    if retry_after is not None:
+                        backoff = retry_after
+                        # Everyone else is over the same quota; hold them too.
+                        _limiter.pause(retry_after)
+                    else:
+                        backoff = RATE_LIMIT_BACKOFF_SECONDS * (2 ** attempt)
                     logger.warning(
                         f"[{API_PROVIDER}] 429 rate limit, backoff {backoff:.1f}s then retry ({attempt + 1}/{MAX_RATE_LIMIT_RETRIES})"
                     )
                     time.sleep(backoff)
                     continue
-            logger.error(f"[{API_PROVIDER}] API call error: {e}")
+            logger.error(f"[{API_PROVIDER}] API call error ({e.status_code}): {e}")
             # Local Ollama can return 429 when previous timed-out requests are still running.
             # Brief backoff reduces retry pressure and queue buildup.
-            if IS_LOCAL and ("429" in msg or "too many concurrent requests" in msg):
+            if IS_LOCAL and overloaded:
                 time.sleep(2.0)
             return None
+        except Exception as e:
+            logger.error(f"[{API_PROVIDER}] API call error: {e}")
+            return None
     return None
 
 
@@ -613,33 +1478,50 @@ def analyze_articles(articles: list[Article], mock: bool = False) -> list[Analyz
     Returns list of successfully analyzed articles.
     """
     logger.info(f"[{API_PROVIDER}] Starting analysis of {len(articles)} articles (Mock={mock})")
-    results: list[AnalyzedArticle] = []
     if not articles:
-        return results
-
-    # Keep deterministic order while still using concurrent requests.
-    # 保持结果顺序确定，同时使用并发请求
-    indexed: dict[int, AnalyzedArticle] = {}
-    with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+        return []
+
+    # Keep deterministic order while still using concurrent requests: each worker's
+    # results land in their input slot. 保持结果顺序确定，同时使用并发请求
+    slots: list[AnalyzedArticle | None] = [None] * len(articles)
+    if not mock:
+        _load_result_cache()
+    deadline = ANALYSIS_DEADLINE_SECONDS if ANALYSIS_DEADLINE_SECONDS > 0 else None
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY)
+    deadline_hit = False
+    chunk_size = 1 if IS_LOCAL else BATCH_SIZE
+    try:
         future_map = {
-            executor.submit(analyze_article, article, mock): (idx, article)
-            for idx, article in enumerate(articles)
+            executor.submit(_analyze_chunk, articles[start:start + chunk_size], mock): start
+            for start in range(0, len(articles), chunk_size)
         }
-        for future in as_completed(future_map):
-            idx, article = future_map[future]
-            logger.info(
-                f"[{API_PROVIDER}] Processing {idx + 1}/{len(articles)}: {article.title[:50]}"
-            )
+        for future in as_completed(future_map, timeout=deadline):
+            start = future_map[future]
             try:
-                analyzed = future.result(timeout=REQUEST_TIMEOUT_SECONDS + 5)
+                # Already completed: as_completed only yields finished futures.
+                chunk_results = future.result()
             except Exception as e:
                 logger.error(f"[{API_PROVIDER}] Analysis worker failed: {e}")
-                analyzed = None
-            if analyzed:
-                indexed[idx] = analyzed
+                chunk_results = []
+            for offset, analyzed in enumerate(chunk_results):
+                idx = start + offset
+                logger.info(
+                    f"[{API_PROVIDER}] Processing {idx + 1}/{len(articles)}: {articles[idx].title[:50]}"
+                )
+                slots[idx] = analyzed
+    except FuturesTimeoutError:
+        deadline_hit = True
+        logger.error(
+            f"[{API_PROVIDER}] Analysis deadline of {ANALYSIS_DEADLINE_SECONDS:g}s reached; "
+            f"keeping {sum(a is not None for a in slots)} finished result(s)"
+        )
+    finally:
+        # On deadline, drop queued articles and let in-flight calls expire via client timeout.
+        executor.shutdown(wait=not deadline_hit, cancel_futures=deadline_hit)
 
-    for idx in sorted(indexed):
-        results.append(indexed[idx])
+    results = [analyzed for analyzed in slots if analyzed]
+    if not mock:
+        _save_result_cache()
 
     logger.info(f"[{API_PROVIDER}] Successfully analyzed {len(results)}/{len(articles)} articles")
     return results
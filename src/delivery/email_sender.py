@@ -4,18 +4,29 @@
 使用 SMTP 协议发送 HTML 或纯文本格式的日报。
 """
 
+import atexit
+import io
 import logging
 import smtplib
+import ssl
+import threading
 import json
 import os
 import re
+from collections.abc import Callable
 from datetime import date
+from functools import cache, lru_cache
+from pathlib import Path
+from types import SimpleNamespace
 from dataclasses import replace
+from email.charset import Charset
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Any
 
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup
 from openai import OpenAI
 
 from config import (
@@ -29,6 +40,7 @@ from config import (
     LLM_BASE_URL,
     LLM_MODEL,
 )
+from src.json_compat import json_loads
 from src.models import AnalyzedArticle
 
 logger = logging.getLogger(__name__)
@@ -39,12 +51,33 @@ TECHNICIAN_LANGUAGE_GUARD_ENABLED = (
 TECHNICIAN_GUARD_MAX_REWRITE = max(0, int(os.getenv("TECHNICIAN_GUARD_MAX_REWRITE", "8")))
 TECHNICIAN_GUARD_TIMEOUT_SECONDS = float(os.getenv("TECHNICIAN_GUARD_TIMEOUT_SECONDS", "45"))
 TECHNICIAN_GUARD_MAX_TOKENS = int(os.getenv("TECHNICIAN_GUARD_MAX_TOKENS", "700"))
+SMTP_TIMEOUT_SECONDS = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+# RCPT TO per envelope; many MTAs cap this (often at 50 or 100). 0 = no split.
+SMTP_MAX_RECIPIENTS = max(0, int(os.getenv("SMTP_MAX_RECIPIENTS", "50")))
+# Plain-text-only mail for list aliases that strip HTML: no HTML render, no multipart wrapper.
+EMAIL_PLAIN_ONLY = os.getenv("EMAIL_PLAIN_ONLY", "false").lower() == "true"
+# Single text/html part: skips the plain-text render. EMAIL_PLAIN_ONLY wins if both are set.
+EMAIL_HTML_ONLY = os.getenv("EMAIL_HTML_ONLY", "false").lower() == "true"
+
+# Language-guard patterns, compiled once (checked for every technician article).
+_MD_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+_LATIN_WORD_RE = re.compile(r"[A-Za-zÄÖÜäöüß]+")
+_ENGLISH_STOPWORDS = frozenset({
+    "the", "and", "for", "with", "from", "this", "that", "are", "is", "to", "of", "in",
+    "on", "as", "by", "an", "or", "be", "can", "will", "at", "it", "using", "model",
+})
+_GERMAN_STOPWORDS = frozenset({
+    "und", "der", "die", "das", "mit", "fuer", "für", "ist", "im", "in", "auf", "eine",
+    "einer", "den", "dem", "zu", "als", "wird", "durch", "bei", "aus", "vom", "zur",
+    "an", "vom", "nach", "ohne",
+})
 
 
 I18N_LABELS = {
     "en": {
         "title": "Industrial AI Daily Digest",
-        "stats": "Selected <strong>{{ count }}</strong> relevant updates today",
+        "stats": Markup("Selected <strong>{count}</strong> relevant updates today"),
         "simple_explain_label": "Plain Explanation",
         "application_label": "Application Context",
         "source_label": "Source",
@@ -55,7 +88,7 @@ I18N_LABELS = {
     },
     "de": {
         "title": "Tageszusammenfassung Industrielle KI",
-        "stats": "Heute wurden <strong>{{ count }}</strong> relevante Berichte ausgewählt",
+        "stats": Markup("Heute wurden <strong>{count}</strong> relevante Berichte ausgewählt"),
         "simple_explain_label": "Einfach Erklaert",
         "application_label": "Anwendungskontext",
         "source_label": "Quelle",
@@ -69,124 +102,88 @@ I18N_LABELS = {
 }
 
 
-EMAIL_TEMPLATE = Template(
-    """\
-<!DOCTYPE html>
-<html>
-<head>
-<meta charset="utf-8">
-<style>
-  body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-         max-width: 760px; margin: 0 auto; padding: 20px; color: #1f2937; background: #f3f5f9; }
-  .header { background: linear-gradient(120deg, #0b3c7f, #0f5db8); color: #fff;
-            padding: 22px; border-radius: 12px; margin-bottom: 14px; }
-  .header h1 { margin: 0; font-size: 22px; letter-spacing: 0.2px; }
-  .header .date { opacity: 0.9; font-size: 13px; margin-top: 6px; }
-  .overview { background: #fff; border: 1px solid #dbe3ee; border-radius: 12px; padding: 16px; margin-bottom: 14px; }
-  .overview h2 { margin: 0 0 10px; font-size: 16px; color: #0b3c7f; }
-  .overview p { margin: 0 0 10px; font-size: 14px; line-height: 1.55; }
-  .overview ul { margin: 6px 0 0 18px; padding: 0; }
-  .overview li { margin: 5px 0; font-size: 13px; line-height: 1.45; }
-  .article { background: #fff; border: 1px solid #dbe3ee; border-radius: 12px; padding: 16px; margin-bottom: 12px; }
-  .category { display: inline-block; background: #eaf2ff; color: #144a9e;
-              padding: 3px 9px; border-radius: 999px; font-size: 12px; font-weight: 600; }
-  .article h3 { margin: 8px 0 6px; font-size: 17px; color: #0f172a; }
-  .subtle { font-size: 12px; color: #667085; margin-bottom: 10px; }
-  .row { margin: 8px 0; }
-  .label { display: block; font-size: 12px; color: #475467; font-weight: 700; text-transform: uppercase;
-           letter-spacing: 0.2px; margin-bottom: 4px; }
-  .value { font-size: 14px; line-height: 1.6; color: #1f2937; }
-  .source { margin-top: 10px; font-size: 13px; color: #344054; }
-  .source a { color: #175cd3; text-decoration: none; }
-  .footer { text-align: center; padding: 16px 8px 8px; font-size: 12px; color: #98a2b3; }
-  .extra { background: #fff; border: 1px solid #dbe3ee; border-radius: 12px; padding: 14px; margin: 12px 0; }
-  .extra h2 { margin: 0 0 10px; font-size: 15px; color: #0b3c7f; }
-  .extra h3 { margin: 12px 0 8px; font-size: 13px; color: #0f3d86; }
-  .extra table { width: 100%; border-collapse: collapse; font-size: 12px; }
-  .extra th, .extra td { border-bottom: 1px solid #e6ebf2; padding: 6px 4px; text-align: left; vertical-align: top; }
-  .extra th { color: #475467; font-weight: 700; }
-  .extra a { color: #175cd3; text-decoration: none; }
-</style>
-</head>
-<body>
-  <div class="header">
-    <h1>{{ labels.title }}</h1>
-    <div class="date">{{ today }} | {% if persona == 'technician' %}Industrielle KI & Simulation{% else %}Industrial AI & Simulation{% endif %}</div>
-  </div>
-
-  <div class="overview">
-    <h2>{{ labels.overview_title }}</h2>
-    <p>{{ labels.stats | replace('{{ count }}', articles|length|string) }}</p>
-  </div>
-
-  {% for article in articles %}
-  <div class="article">
-    <span class="category">{{ article.category_tag }}</span>
-
-    <h3>{{ article.display_title }}</h3>
-    {% if article.title_en %}
-    <div class="subtle">{{ article.title_en }}</div>
-    {% endif %}
-
-    <div class="row">
-      <span class="label">{{ labels.application_label }}</span>
-      <div class="value">{{ article.context_compact }}</div>
-    </div>
-
-    <div class="row">
-      <span class="label">{{ labels.simple_explain_label }}</span>
-      <div class="value">{{ article.simple_explanation }}</div>
-    </div>
-
-    <div class="source">
-      {{ labels.source_label }}: {{ article.source_name }} |
-      <a href="{{ article.source_url }}">{{ labels.link_label }}</a>
-    </div>
-  </div>
-  {% endfor %}
-
-  {% if pending_articles %}
-  <div class="extra">
-    <h2>{{ labels.pending_title if labels.pending_title else 'Weitere Relevante Artikel (nicht analysiert)' }}</h2>
-    {% for group in pending_articles %}
-    <h3>{{ group.domain_label }}</h3>
-    {% if group.items_list %}
-    <table>
-      <thead>
-        <tr>
-          <th>#</th>
-          <th>Kategorie</th>
-          <th>Titel</th>
-          <th>Link</th>
-        </tr>
-      </thead>
-      <tbody>
-        {% for item in group.items_list %}
-        <tr>
-          <td>{{ loop.index }}</td>
-          <td>{{ item.category }}</td>
-          <td>{{ item.title }}</td>
-          <td><a href="{{ item.url }}">{% if persona == 'technician' %}Oeffnen{% else %}Open{% endif %}</a></td>
-        </tr>
-        {% endfor %}
-      </tbody>
-    </table>
-    {% else %}
-    <div class="value">{{ labels.pending_empty if labels.pending_empty else 'Keine unanalysierten Artikel in dieser Kategorie.' }}</div>
-    {% endif %}
-    {% endfor %}
-  </div>
-  {% endif %}
-
-  <div class="footer">
-    {{ labels.footer }}
-  </div>
-</body>
-</html>
-"""
+# One Environment for the process: templates are parsed once and cached by name.
+# Autoescape is on for .html: the i18n labels that carry trusted inline markup (<strong>) are Markup.
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+
+def _template_bytecode_cache() -> FileSystemBytecodeCache | None:
+    """
+    Compiled-template cache shared across the daily cron runs, so a cold start loads
+    bytecode instead of re-parsing digest.html. Defaults to a per-user temp directory.
+    """
+    cache_dir = os.getenv("JINJA_BYTECODE_CACHE_DIR") or None
+    try:
+        if cache_dir is not None:
+            # Jinja only writes into the directory; a missing one would fail every render.
+            os.makedirs(cache_dir, exist_ok=True)
+            if not os.access(cache_dir, os.W_OK | os.X_OK):
+                raise PermissionError(f"{cache_dir} is not writable")
+        # The cache is keyed on template source only, so the pattern carries the Environment
+        # settings that change generated code (autoescape): stale unescaped bytecode is never reused.
+        return FileSystemBytecodeCache(cache_dir, pattern="__digest_autoescape_%s.cache")
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"[EMAIL] Template bytecode cache disabled: {e}")
+        return None
+
+
+_TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(_TEMPLATE_DIR),
+    auto_reload=False,
+    cache_size=-1,
+    # Article text from feeds/LLM is escaped in digest.html (MarkupSafe C speedups); digest.txt stays raw.
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=_template_bytecode_cache(),
 )
 
 
+# Loaded on first render, so dry-run and markdown-only runs never parse digest.html.
+@cache
+def _html_template() -> Template:
+    return _TEMPLATE_ENV.get_template("digest.html")
+
+
+@cache
+def _text_template() -> Template:
+    return _TEMPLATE_ENV.get_template("digest.txt")
+
+
+TEXT_LABELS = {
+    "en": {
+        "header": "[Industrial AI Digest]",
+        "count": "Articles",
+        "app": "Application",
+        "explain": "Explain",
+        "source": "Source",
+        "pending_title": "More relevant articles (not analyzed):",
+        "pending_empty": "No unanalyzed articles in this category.",
+    },
+    "de": {
+        "header": "[Tagesuebersicht Industrielle KI]",
+        "count": "Artikel",
+        "app": "Anwendung",
+        "explain": "Erklaerung",
+        "source": "Quelle",
+        "pending_title": "Weitere Relevante Artikel (nicht analysiert):",
+        "pending_empty": "Keine unanalysierten Artikel in dieser Kategorie.",
+    },
+}
+
+
+# Attribute views of the label tables, used by both the renderers and the templates. Jinja
+# resolves `labels.x` with getattr() first and only then falls back to labels["x"], so plain
+# dicts pay a failed attribute lookup per access. HTML-bearing labels are already Markup.
+# Fallbacks for labels a language leaves out are filled in here, not per render.
+_HTML_LABEL_DEFAULTS = {
+    "pending_title": "Weitere Relevante Artikel (nicht analysiert)",
+    "pending_empty": "Keine unanalysierten Artikel in dieser Kategorie.",
+}
+_HTML_LABELS_NS = {
+    lang: SimpleNamespace(**{**_HTML_LABEL_DEFAULTS, **labels}) for lang, labels in I18N_LABELS.items()
+}
+_TEXT_LABELS_NS = {lang: SimpleNamespace(**labels) for lang, labels in TEXT_LABELS.items()}
+
+
 def _clip(text: str, limit: int) -> str:
     # Keep full content; clipping disabled by product rule.
     _ = limit
@@ -225,15 +222,15 @@ def _extract_json_obj(text: str) -> dict | None:
     if not raw:
         return None
     try:
-        parsed = json.loads(raw)
+        parsed = json_loads(raw)
         return parsed if isinstance(parsed, dict) else None
     except json.JSONDecodeError:
         pass
 
-    md = re.search(r"```(?:json)?\s*(\{.*\})\s*```", raw, re.DOTALL)
+    md = _MD_JSON_RE.search(raw)
     if md:
         try:
-            parsed = json.loads(md.group(1))
+            parsed = json_loads(md.group(1))
             return parsed if isinstance(parsed, dict) else None
         except json.JSONDecodeError:
             return None
@@ -242,7 +239,7 @@ def _extract_json_obj(text: str) -> dict | None:
     end = raw.rfind("}")
     if start != -1 and end > start:
         try:
-            parsed = json.loads(raw[start : end + 1])
+            parsed = json_loads(raw[start : end + 1])
             return parsed if isinstance(parsed, dict) else None
         except json.JSONDecodeError:
             return None
@@ -260,27 +257,21 @@ def _needs_german_rewrite(article: AnalyzedArticle) -> bool:
     if not text:
         return False
 
-    cjk_chars = len(re.findall(r"[\u4e00-\u9fff]", text))
-    words = re.findall(r"[A-Za-zÄÖÜäöüß]+", text)
+    cjk_chars = len(_CJK_RE.findall(text))
+    if cjk_chars >= 8:
+        # Decided already; skip the lower-casing, word scan and stopword counts.
+        return True
+    # Lower-case the text once instead of every word; counting below stays in C (map + sum).
+    words = _LATIN_WORD_RE.findall(text.lower())
     if not words:
         return cjk_chars > 0
 
-    english_stopwords = {
-        "the", "and", "for", "with", "from", "this", "that", "are", "is", "to", "of", "in",
-        "on", "as", "by", "an", "or", "be", "can", "will", "at", "it", "using", "model",
-    }
-    german_stopwords = {
-        "und", "der", "die", "das", "mit", "fuer", "für", "ist", "im", "in", "auf", "eine",
-        "einer", "den", "dem", "zu", "als", "wird", "durch", "bei", "aus", "vom", "zur",
-        "an", "vom", "nach", "ohne",
-    }
-    english_hits = sum(1 for w in words if w.lower() in english_stopwords)
-    german_hits = sum(1 for w in words if w.lower() in german_stopwords)
-    latin_words = sum(1 for w in words if re.fullmatch(r"[A-Za-z]+", w) is not None)
+    english_hits = sum(map(_ENGLISH_STOPWORDS.__contains__, words))
+    german_hits = sum(map(_GERMAN_STOPWORDS.__contains__, words))
+    # Words are letters only, so ASCII means no umlaut/ß.
+    latin_words = sum(map(str.isascii, words))
     latin_ratio = latin_words / max(1, len(words))
 
-    if cjk_chars >= 8:
-        return True
     if english_hits >= 6 and english_hits >= german_hits * 2:
         return True
     if latin_ratio > 0.75 and german_hits <= 2 and len(words) >= 24:
@@ -337,18 +328,39 @@ def _rewrite_to_german(article: AnalyzedArticle) -> AnalyzedArticle:
     )
 
 
+def _rewrite_cache_key(article: AnalyzedArticle) -> tuple[str, str, str, str]:
+    return (
+        article.source_url,
+        article.title_de,
+        article.german_context,
+        article.technician_analysis_de,
+    )
+
+
+# Successful rewrites for this process. The technician profile and every --forward address
+# get the same articles; without this each send would repeat the LLM rewrite calls.
+_german_rewrite_cache: dict[tuple[str, str, str, str], AnalyzedArticle] = {}
+
+
 def _enforce_technician_language_guard(articles: list[AnalyzedArticle]) -> list[AnalyzedArticle]:
     if not TECHNICIAN_LANGUAGE_GUARD_ENABLED:
         return articles
     rewritten: list[AnalyzedArticle] = []
     rewrites = 0
     for article in articles:
-        if rewrites < TECHNICIAN_GUARD_MAX_REWRITE and _needs_german_rewrite(article):
+        key = _rewrite_cache_key(article)
+        cached = _german_rewrite_cache.get(key)
+        if cached is not None:
+            rewritten.append(cached)
+        elif rewrites < TECHNICIAN_GUARD_MAX_REWRITE and _needs_german_rewrite(article):
             logger.warning(
                 "[LANG_GUARD] Non-German ratio high, rewriting article: %s",
                 (article.title_en or article.title_de)[:80],
             )
-            rewritten.append(_rewrite_to_german(article))
+            result = _rewrite_to_german(article)
+            if result is not article:
+                _german_rewrite_cache[key] = result
+            rewritten.append(result)
             rewrites += 1
         else:
             rewritten.append(article)
@@ -357,25 +369,31 @@ def _enforce_technician_language_guard(articles: list[AnalyzedArticle]) -> list[
     return rewritten
 
 
+# Checked in order; the first entry with any matching substring wins.
+_GERMAN_CATEGORY_MAP: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("digital twin",), "Digitaler Zwilling"),
+    (("industry 4.0", "industrie 4.0"), "Industrie 4.0"),
+    (("simulation",), "Simulation"),
+    (("ai", "künstliche intelligenz"), "Kuenstliche Intelligenz"),
+    (("research",), "Forschung"),
+    (("factory", "manufacturing"), "Fabrik"),
+    (("robot", "humanoid"), "Robotik"),
+    (("automotive", "vehicle"), "Automobil"),
+    (("supply chain", "logistics"), "Lieferkette"),
+    (("energy", "grid", "power"), "Energie"),
+    (("cyber", "security", "ot security", "ics"), "Cybersicherheit"),
+)
+
+
+@lru_cache(maxsize=512)
 def _to_german_category(tag: str) -> str:
+    # Tags repeat across a digest (and across the HTML and text rows), so memoize the scan.
     value = (tag or "").strip()
     lower = value.lower()
-    mapping = [
-        (("digital twin",), "Digitaler Zwilling"),
-        (("industry 4.0", "industrie 4.0"), "Industrie 4.0"),
-        (("simulation",), "Simulation"),
-        (("ai", "künstliche intelligenz"), "Kuenstliche Intelligenz"),
-        (("research",), "Forschung"),
-        (("factory", "manufacturing"), "Fabrik"),
-        (("robot", "humanoid"), "Robotik"),
-        (("automotive", "vehicle"), "Automobil"),
-        (("supply chain", "logistics"), "Lieferkette"),
-        (("energy", "grid", "power"), "Energie"),
-        (("cyber", "security", "ot security", "ics"), "Cybersicherheit"),
-    ]
-    for keys, translated in mapping:
-        if any(k in lower for k in keys):
-            return translated
+    for keys, translated in _GERMAN_CATEGORY_MAP:
+        for key in keys:
+            if key in lower:
+                return translated
     return value or "Sonstiges"
 
 
@@ -393,40 +411,38 @@ def _normalize_pending_articles(pending_articles: list[dict] | None) -> list[dic
             if not isinstance(group, dict):
                 continue
             raw_items = group.get("items", [])
-            items_list: list[dict[str, str]] = []
-            if isinstance(raw_items, list):
-                for item in raw_items:
-                    if not isinstance(item, dict):
-                        continue
-                    items_list.append(
-                        {
-                            "category": str(item.get("category", "") or ""),
-                            "title": str(item.get("title", "") or ""),
-                            "url": str(item.get("url", "") or ""),
-                        }
-                    )
+            if not isinstance(raw_items, list):
+                raw_items = []
             normalized.append(
                 {
                     "domain_key": str(group.get("domain_key", "") or ""),
                     "domain_label": str(group.get("domain_label", "General") or "General"),
-                    "items_list": items_list,
+                    "items_list": _normalize_pending_items(raw_items),
                 }
             )
         return normalized
 
     # Backward-compatible flat mode: treat as one generic group.
-    flat_items: list[dict[str, str]] = []
-    for item in pending_articles:
-        if not isinstance(item, dict):
-            continue
-        flat_items.append(
-            {
-                "category": str(item.get("category", "") or ""),
-                "title": str(item.get("title", "") or ""),
-                "url": str(item.get("url", "") or ""),
-            }
-        )
-    return [{"domain_key": "general", "domain_label": "General", "items_list": flat_items}]
+    return [
+        {
+            "domain_key": "general",
+            "domain_label": "General",
+            "items_list": _normalize_pending_items(pending_articles),
+        }
+    ]
+
+
+def _normalize_pending_items(raw_items: list) -> list[dict[str, str]]:
+    """Shared by grouped and flat mode: keep dict rows, coerce the three shown fields to str."""
+    return [
+        {
+            "category": str(item.get("category", "") or ""),
+            "title": str(item.get("title", "") or ""),
+            "url": str(item.get("url", "") or ""),
+        }
+        for item in raw_items
+        if isinstance(item, dict)
+    ]
 
 
 def _profile_name(profile: object | None) -> str:
@@ -441,71 +457,141 @@ def _profile_name(profile: object | None) -> str:
     return "Default"
 
 
-def render_digest(
-    articles: list[AnalyzedArticle],
-    today: str | None = None,
-    profile: object | None = None,
-    pending_articles: list[dict] | None = None,
-) -> str:
-    """Render the daily digest as HTML (渲染 HTML 摘要)."""
-    if today is None:
-        today = date.today().strftime("%Y-%m-%d")
+def _today_str() -> str:
+    # isoformat() is the same YYYY-MM-DD without strftime's format parsing.
+    return date.today().isoformat()
+
+
+def _digest_persona(profile: object | None) -> str:
+    return str(getattr(profile, "persona", "")).strip().lower() if profile else ""
+
 
-    lang = getattr(profile, "language", "en") if profile else "en"
-    persona = str(getattr(profile, "persona", "")).strip().lower() if profile else ""
+def _html_lang(profile: object | None, persona: str) -> str:
     if persona == "student":
         # Student template is English-only by requirement.
-        lang = "en"
-    labels = I18N_LABELS.get(lang, I18N_LABELS["en"])
+        return "en"
+    return getattr(profile, "language", "en") if profile else "en"
 
-    rendered_articles = []
-    for article in articles:
-        if persona == "technician":
-            context_compact = _clip(article.german_context or "N/A", 200)
-            mechanism_text = article.technician_analysis_de or "N/A"
-            explain_compact = _clip(mechanism_text, 220)
-            title_en_compact = ""
-            category_tag = _to_german_category(article.category_tag)
-            display_title = _clip(article.title_de or article.title_en, 90)
-        else:
-            context_compact = (
-                _clip(article.summary_en or "N/A", 140)
-                if lang == "en"
-                else _clip(article.summary_en or "N/A", 140)
-            )
-            explain_compact = (
-                _clip(article.simple_explanation or article.summary_en or "N/A", 200)
-                if lang == "en"
-                else _clip(article.simple_explanation or "N/A", 200)
-            )
-            title_en_compact = _clip(article.title_en or "", 110)
-            category_tag = article.category_tag
-            display_title = _clip(_pick_title(article, lang), 90)
-
-        rendered_articles.append(
-            {
-                "category_tag": category_tag,
-                "display_title": display_title,
-                "title_en": title_en_compact,
-                "context_compact": context_compact,
-                "simple_explanation": explain_compact,
-                "source_name": article.source_name,
-                "source_url": article.source_url,
-            }
-        )
 
-    normalized_pending = _normalize_pending_articles(pending_articles)
+def _text_lang(persona: str) -> str:
+    return "de" if persona == "technician" else "en"
+
+
+# Markup.format escapes its argument, so the fragment stays safe under autoescape.
+_SUBTITLE_HTML = Markup('<div class="subtle">{}</div>')
+
+
+def _html_technician_row(article: AnalyzedArticle, lang: str) -> dict[str, str]:
+    return {
+        "category_tag": _to_german_category(article.category_tag),
+        "display_title": _clip(article.title_de or article.title_en, 90),
+        "subtitle_html": "",
+        "context_compact": _clip(article.german_context or "N/A", 200),
+        "simple_explanation": _clip(article.technician_analysis_de or "N/A", 220),
+        "source_name": article.source_name,
+        "source_url": article.source_url,
+    }
+
+
+def _html_default_row(article: AnalyzedArticle, lang: str) -> dict[str, str]:
+    summary_en = article.summary_en
+    if lang == "en":
+        explain_compact = _clip(article.simple_explanation or summary_en or "N/A", 200)
+    else:
+        explain_compact = _clip(article.simple_explanation or "N/A", 200)
+    title_en_compact = _clip(article.title_en or "", 110)
+    return {
+        "category_tag": article.category_tag,
+        "display_title": _clip(_pick_title(article, lang), 90),
+        "subtitle_html": _SUBTITLE_HTML.format(title_en_compact) if title_en_compact else "",
+        "context_compact": _clip(summary_en or "N/A", 140),
+        "simple_explanation": explain_compact,
+        "source_name": article.source_name,
+        "source_url": article.source_url,
+    }
+
+
+def _html_row_builder(persona: str) -> Callable[[AnalyzedArticle, str], dict[str, str]]:
+    """Row builder for the persona, picked once per render instead of branching per article."""
+    return _html_technician_row if persona == "technician" else _html_default_row
+
 
-    return EMAIL_TEMPLATE.render(
+def _text_de_row(article: AnalyzedArticle) -> dict[str, str]:
+    return {
+        "category": _to_german_category(article.category_tag),
+        "title": _clip(article.title_de or article.title_en, 100),
+        "app": _clip(article.german_context or "N/A", 140),
+        "explain": _clip(article.technician_analysis_de or "N/A", 180),
+        "source_name": article.source_name,
+        "source_url": article.source_url,
+    }
+
+
+def _text_en_row(article: AnalyzedArticle) -> dict[str, str]:
+    summary_en = article.summary_en
+    return {
+        "category": article.category_tag,
+        "title": _clip(article.title_en or article.title_de, 100),
+        "app": _clip(summary_en or "N/A", 140),
+        "explain": _clip(article.simple_explanation or summary_en or "N/A", 180),
+        "source_name": article.source_name,
+        "source_url": article.source_url,
+    }
+
+
+def _text_row_builder(lang: str) -> Callable[[AnalyzedArticle], dict[str, str]]:
+    return _text_de_row if lang == "de" else _text_en_row
+
+
+def _render_html(
+    rows: list[dict[str, str]],
+    today: str,
+    profile: object | None,
+    pending: list[dict[str, Any]],
+    persona: str,
+    lang: str,
+) -> str:
+    # Page-level choices are resolved here once instead of as {% if %} branches per row.
+    labels = _HTML_LABELS_NS.get(lang) or _HTML_LABELS_NS["en"]
+    technician = persona == "technician"
+    return _html_template().render(
         today=today,
-        articles=rendered_articles,
-        pending_articles=normalized_pending,
+        articles=rows,
+        pending_articles=pending,
         profile=profile,
         labels=labels,
-        persona=persona,
+        stats=labels.stats.format(count=len(rows)),
+        tagline="Industrielle KI & Simulation" if technician else "Industrial AI & Simulation",
+        open_label="Oeffnen" if technician else "Open",
     )
 
 
+def _render_text(rows: list[dict[str, str]], today: str, pending: list[dict[str, Any]], lang: str) -> str:
+    return _text_template().render(
+        today=today,
+        articles=rows,
+        pending_articles=pending,
+        labels=_TEXT_LABELS_NS[lang],
+    )
+
+
+def render_digest(
+    articles: list[AnalyzedArticle],
+    today: str | None = None,
+    profile: object | None = None,
+    pending_articles: list[dict] | None = None,
+) -> str:
+    """Render the daily digest as HTML (渲染 HTML 摘要)."""
+    if today is None:
+        today = _today_str()
+    persona = _digest_persona(profile)
+    lang = _html_lang(profile, persona)
+    build_row = _html_row_builder(persona)
+    rows = [build_row(article, lang) for article in articles]
+    pending = _normalize_pending_articles(pending_articles)
+    return _render_html(rows, today, profile, pending, persona, lang)
+
+
 def render_digest_text(
     articles: list[AnalyzedArticle],
     today: str | None = None,
@@ -514,68 +600,190 @@ def render_digest_text(
 ) -> str:
     """Render the daily digest as plain text (渲染纯文本摘要 - 用于 dry-run 或邮件备选部分)."""
     if today is None:
-        today = date.today().strftime("%Y-%m-%d")
+        today = _today_str()
+    lang = _text_lang(_digest_persona(profile))
+    build_row = _text_row_builder(lang)
+    rows = [build_row(article) for article in articles]
+    return _render_text(rows, today, _normalize_pending_articles(pending_articles), lang)
 
-    persona = str(getattr(profile, "persona", "")).strip().lower() if profile else ""
-    if persona == "student":
-        lang = "en"
-    elif persona == "technician":
-        lang = "de"
-    else:
-        lang = "en"
 
-    if lang == "de":
-        lines = [f"[Tagesuebersicht Industrielle KI] {today}", f"Artikel: {len(articles)}"]
-    else:
-        lines = [f"[Industrial AI Digest] {today}", f"Articles: {len(articles)}"]
+def render_digest_parts(
+    articles: list[AnalyzedArticle],
+    today: str | None = None,
+    profile: object | None = None,
+    pending_articles: list[dict] | None = None,
+) -> tuple[str, str]:
+    """
+    Render (html, text) for one email: a single pass over the articles feeds both
+    templates, and pending rows are normalized once.
+    """
+    if today is None:
+        today = _today_str()
+    persona = _digest_persona(profile)
+    html_lang = _html_lang(profile, persona)
+    text_lang = _text_lang(persona)
+    html_rows: list[dict[str, str]] = []
+    text_rows: list[dict[str, str]] = []
+    # Loop-invariant choices and lookups bound to locals once, outside the per-article loop.
+    html_row, text_row = _html_row_builder(persona), _text_row_builder(text_lang)
+    add_html, add_text = html_rows.append, text_rows.append
+    for article in articles:
+        add_html(html_row(article, html_lang))
+        add_text(text_row(article))
+    pending = _normalize_pending_articles(pending_articles)
+    return (
+        _render_html(html_rows, today, profile, pending, persona, html_lang),
+        _render_text(text_rows, today, pending, text_lang),
+    )
 
-    lines.append("\nDetails:\n")
 
-    for article in articles:
-        if lang == "de":
-            display_title = _clip(article.title_de or article.title_en, 100)
-            explain = _clip(article.technician_analysis_de or "N/A", 180)
-            app = _clip(article.german_context or "N/A", 140)
-            category = _to_german_category(article.category_tag)
-        else:
-            display_title = _clip(article.title_en or article.title_de, 100)
-            explain = _clip(article.simple_explanation or article.summary_en or "N/A", 180)
-            app = _clip(article.summary_en or "N/A", 140)
-            category = article.category_tag
-        lines.append(f"[{category}] {display_title}")
-        if lang == "de":
-            lines.append(f"- Anwendung: {app}")
-            lines.append(f"- Erklaerung: {explain}")
-            lines.append(f"- Quelle: {article.source_name} | {article.source_url}")
-        else:
-            lines.append(f"- Application: {app}")
-            lines.append(f"- Explain: {explain}")
-            lines.append(f"- Source: {article.source_name} | {article.source_url}")
-        lines.append("")
-
-    normalized_pending = _normalize_pending_articles(pending_articles)
-    if normalized_pending:
-        if lang == "de":
-            lines.append("Weitere Relevante Artikel (nicht analysiert):")
+# utf-8 with no body transfer encoding: MIMEText then marks the part 7bit/8bit instead of base64.
+_UTF8_8BIT = Charset("utf-8")
+# typeshed declares body_encoding as int, but email.charset itself uses None for "no encoding".
+_UTF8_8BIT.body_encoding = None  # type: ignore[assignment]
+# RFC 5322 line limit; longer lines have to stay base64 even on 8BITMIME servers.
+_SMTP_MAX_LINE = 998
+
+
+def _mime_text(content: str, subtype: str, eight_bit: bool) -> MIMEText:
+    if eight_bit and all(len(line) <= _SMTP_MAX_LINE for line in content.encode("utf-8").splitlines()):
+        # MIMEText accepts a Charset instance at runtime; the stubs only allow a charset name.
+        return MIMEText(content, subtype, _UTF8_8BIT)  # type: ignore[arg-type]
+    return MIMEText(content, subtype, "utf-8")
+
+
+def _build_message(
+    text_content: str | None, html_content: str | None, eight_bit: bool
+) -> MIMEMultipart | MIMEText:
+    """
+    Plain text alone, HTML alone, or text + HTML alternatives. With eight_bit (server has
+    8BITMIME) the UTF-8 bodies go out raw instead of ~33% larger base64.
+    """
+    if html_content is None:
+        return _mime_text(text_content or "", "plain", eight_bit)
+    if text_content is None:
+        return _mime_text(html_content, "html", eight_bit)
+    msg = MIMEMultipart("alternative")
+    msg.attach(_mime_text(text_content, "plain", eight_bit))
+    msg.attach(_mime_text(html_content, "html", eight_bit))
+    return msg
+
+
+def _to_header(recipient: str) -> bytes:
+    """Serialized `To:` line for one copy, encoded exactly as msg["To"] would be."""
+    header = Message()
+    header["To"] = recipient
+    return header.as_bytes()[:-1]
+
+
+@lru_cache(maxsize=1)
+def _smtp_ssl_context() -> ssl.SSLContext:
+    """Default TLS context, built once (loading the CA store is the slow part)."""
+    return ssl.create_default_context()
+
+
+class SMTPPool:
+    """
+    One authenticated SMTP session reused across sends (复用 SMTP 连接).
+    Every profile and --forward recipient in a run shares it, so STARTTLS + AUTH
+    happen once; a dropped session is reopened on the next send.
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: str) -> None:
+        self._host = host
+        self._port = port
+        self._user = user
+        self._password = password
+        self._server: smtplib.SMTP | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        implicit_tls = self._port == 465
+        if implicit_tls:
+            # Implicit TLS: the handshake happens on connect, no EHLO/STARTTLS/EHLO round trips.
+            server: smtplib.SMTP = smtplib.SMTP_SSL(
+                self._host, self._port, timeout=SMTP_TIMEOUT_SECONDS, context=_smtp_ssl_context()
+            )
         else:
-            lines.append("More relevant articles (not analyzed):")
-        for group in normalized_pending:
-            lines.append(f"- {group.get('domain_label', '')}")
-            items = group.get("items_list", [])
-            if not items:
-                if lang == "de":
-                    lines.append("  Keine unanalysierten Artikel in dieser Kategorie.")
-                else:
-                    lines.append("  No unanalyzed articles in this category.")
-                continue
-            for idx, item in enumerate(items, start=1):
-                lines.append(
-                    f"  {idx}. [{item.get('category', 'N/A')}] {_clip(item.get('title', 'N/A'), 100)} "
-                    f"| {item.get('url', '')}"
-                )
-        lines.append("")
-
-    return "\n".join(lines)
+            server = smtplib.SMTP(self._host, self._port, timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            if not implicit_tls:
+                server.ehlo()
+                server.starttls(context=_smtp_ssl_context())
+                server.ehlo()
+            server.login(self._user, self._password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _connection(self) -> smtplib.SMTP:
+        server = self._server
+        if server is not None:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except smtplib.SMTPException:
+                pass
+            self._drop()
+        self._server = self._connect()
+        return self._server
+
+    def _drop(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def has_extn(self, name: str) -> bool:
+        """Whether the server advertises an ESMTP extension (opens the session if needed)."""
+        with self._lock:
+            return bool(self._connection().has_extn(name))
+
+    def sendmail(
+        self, from_addr: str, to_addrs: list[str], message: str | bytes, eight_bit: bool = False
+    ) -> dict:
+        """
+        Send one serialized message. Recipients go out in envelopes of at most
+        SMTP_MAX_RECIPIENTS, so an MTA's RCPT cap never rejects the whole DATA;
+        every envelope reuses the same encoded bytes. Returns the refused recipients.
+        """
+        mail_options = ["BODY=8BITMIME"] if eight_bit else []
+        step = SMTP_MAX_RECIPIENTS or len(to_addrs) or 1
+        refused: dict = {}
+        with self._lock:
+            for start in range(0, max(len(to_addrs), 1), step):
+                group = to_addrs[start:start + step]
+                try:
+                    refused.update(self._connection().sendmail(from_addr, group, message, mail_options))
+                except smtplib.SMTPServerDisconnected:
+                    # Server closed the idle session between noop() and DATA; retry once on a fresh one.
+                    self._drop()
+                    refused.update(self._connection().sendmail(from_addr, group, message, mail_options))
+        return refused
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+
+_smtp_pool: SMTPPool | None = None
+_smtp_pool_lock = threading.Lock()
+
+
+def _get_smtp_pool() -> SMTPPool:
+    global _smtp_pool
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPPool(SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS)
+            atexit.register(_smtp_pool.close)
+        return _smtp_pool
+
+
+_SUBJECT_PREFIXES = {"technician": "[Technician] ", "student": "[Student] "}
 
 
 def send_email(
@@ -583,92 +791,132 @@ def send_email(
     today: str | None = None,
     profile: object | None = None,
     pending_articles: list[dict] | None = None,
+    recipients: list[str] | None = None,
 ) -> bool:
-    """Send the daily digest email via SMTP (发送邮件)."""
+    """
+    Send the daily digest email via SMTP (发送邮件).
+    With `recipients`, each address gets its own copy (own To header) of one rendered and
+    encoded message; returns True only if every copy was sent.
+    """
     if not all([SMTP_HOST, SMTP_USER, SMTP_PASS, EMAIL_TO]):
         logger.warning("[EMAIL] SMTP not configured, skipping email delivery")
         return False
 
     if today is None:
-        today = date.today().strftime("%Y-%m-%d")
+        today = _today_str()
 
+    # Resolved once; the guard, the subject and the renderers all key off the same persona.
+    persona = _digest_persona(profile)
     send_articles = articles
-    if profile and hasattr(profile, "persona"):
-        persona = str(getattr(profile, "persona", "")).strip().lower()
-        if persona == "technician":
-            send_articles = _enforce_technician_language_guard(articles)
-
-    html_content = render_digest(send_articles, today, profile, pending_articles=pending_articles)
-
-    msg = MIMEMultipart("alternative")
-    if profile and hasattr(profile, "persona"):
-        persona = str(getattr(profile, "persona", "")).strip().lower()
-        if persona == "technician":
-            subject_prefix = "[Technician] "
-        elif persona == "student":
-            subject_prefix = "[Student] "
-        else:
-            subject_prefix = ""
-    else:
-        subject_prefix = ""
-    if profile and hasattr(profile, "persona") and str(getattr(profile, "persona", "")).strip().lower() == "technician":
-        msg["Subject"] = f"{subject_prefix}📅 {today} Tageszusammenfassung Industrielle KI ({len(articles)})"
+    if persona == "technician":
+        send_articles = _enforce_technician_language_guard(articles)
+
+    html_content: str | None = None
+    text_content: str | None = None
+    if EMAIL_PLAIN_ONLY:
+        text_content = render_digest_text(
+            send_articles, today, pending_articles=pending_articles, profile=profile
+        )
+    elif EMAIL_HTML_ONLY:
+        html_content = render_digest(send_articles, today, profile, pending_articles=pending_articles)
     else:
-        msg["Subject"] = f"{subject_prefix}📅 {today} Industrial AI Digest ({len(send_articles)})"
-    msg["From"] = EMAIL_FROM or SMTP_USER
-
-    recipient = profile.email if profile and hasattr(profile, "email") else EMAIL_TO
-    msg["To"] = recipient
-
-    text_content = render_digest_text(send_articles, today, pending_articles=pending_articles, profile=profile)
-    msg.attach(MIMEText(text_content, "plain", "utf-8"))
-    msg.attach(MIMEText(html_content, "html", "utf-8"))
-
-    try:
-        logger.info(
-            "[EMAIL] Sending digest to %s (Profile: %s)",
-            recipient,
-            _profile_name(profile),
+        html_content, text_content = render_digest_parts(
+            send_articles, today, profile, pending_articles=pending_articles
         )
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASS)
-            server.sendmail(msg["From"], recipient.split(","), msg.as_string())
 
-        logger.info("[EMAIL] ✅ Digest sent successfully")
-        return True
+    subject_prefix = _SUBJECT_PREFIXES.get(persona, "")
+    if persona == "technician":
+        subject = f"{subject_prefix}📅 {today} Tageszusammenfassung Industrielle KI ({len(articles)})"
+    else:
+        subject = f"{subject_prefix}📅 {today} Industrial AI Digest ({len(send_articles)})"
+    sender = EMAIL_FROM or SMTP_USER
+    if recipients is None:
+        recipients = [profile.email if profile and hasattr(profile, "email") else EMAIL_TO]
 
+    try:
+        pool = _get_smtp_pool()
+        eight_bit = pool.has_extn("8bitmime")
+        msg = _build_message(text_content, html_content, eight_bit)
+        msg["Subject"] = subject
+        msg["From"] = sender
+        # Serialized once; each copy below is its own To line prepended to the same bytes.
+        # as_bytes() is the wire format already; as_string() would be re-encoded by smtplib.
+        message_bytes = msg.as_bytes()
     except Exception as e:
         logger.error(f"[EMAIL] Failed to send: {e}")
         return False
 
+    all_sent = True
+    for recipient in recipients:
+        try:
+            logger.info(
+                "[EMAIL] Sending digest to %s (Profile: %s)",
+                recipient,
+                _profile_name(profile),
+            )
+            to_addrs = [addr.strip() for addr in recipient.split(",") if addr.strip()]
+            pool.sendmail(sender, to_addrs, _to_header(recipient) + message_bytes, eight_bit=eight_bit)
+
+            logger.info("[EMAIL] ✅ Digest sent successfully")
+        except Exception as e:
+            logger.error(f"[EMAIL] Failed to send: {e}")
+            all_sent = False
+    return all_sent
+
+
+_MD_HEADER = (
+    "# 📅 {today} 工业 AI 每日摘要 (Industrial AI Daily)\n\n"
+    "> 📊 今日共筛选出 **{count}** 条相关情报\n\n"
+    "---\n"
+).format
+_MD_ARTICLE = (
+    "\n### [{category}] {title}\n\n"
+    "*{title_en}*\n\n\n"
+    "📎 来源：{source_name} | [点击查看原文]({source_url})\n\n"
+    "---\n"
+).format
+
 
 def save_digest_markdown(
     articles: list[AnalyzedArticle], output_dir: str = "output", today: str | None = None
 ) -> str:
     """Save digest as a Markdown file (生成 Markdown 文件 - 邮件的替代方案)."""
-    import os
-
     if today is None:
-        today = date.today().strftime("%Y-%m-%d")
+        today = _today_str()
 
-    os.makedirs(output_dir, exist_ok=True)
-    filepath = os.path.join(output_dir, f"digest-{today}.md")
-
-    lines = [
-        f"# 📅 {today} 工业 AI 每日摘要 (Industrial AI Daily)\n",
-        f"> 📊 今日共筛选出 **{len(articles)}** 条相关情报\n",
-        "---\n",
-    ]
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    filepath = out_dir / f"digest-{today}.md"
 
+    buf = io.StringIO()
+    buf.write(_MD_HEADER(today=today, count=len(articles)))
     for article in articles:
-        lines.append(f"### [{article.category_tag}] {article.title_zh}\n")
-        lines.append(f"*{article.title_en}*\n\n")
-        lines.append(f"📎 来源：{article.source_name} | [点击查看原文]({article.source_url})\n")
-        lines.append("---\n")
+        # AnalyzedArticle has no Chinese title; the German one is the localized headline.
+        buf.write(
+            _MD_ARTICLE(
+                category=article.category_tag,
+                title=article.title_de or article.title_en,
+                title_en=article.title_en,
+                source_name=article.source_name,
+                source_url=article.source_url,
+            )
+        )
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    # Encode once and write the bytes in one call; no text-mode encoder between buffer and file.
+    content = buf.getvalue().encode("utf-8")
+    if _file_has_bytes(filepath, content):
+        # Re-runs of the same day (dry-runs while developing) leave the file and its mtime alone.
+        logger.info(f"[FILE] Digest unchanged: {filepath}")
+        return str(filepath)
+    filepath.write_bytes(content)
 
     logger.info(f"[FILE] Digest saved to {filepath}")
-    return filepath
+    return str(filepath)
+
+
+def _file_has_bytes(path: Path, content: bytes) -> bool:
+    """True if `path` already holds exactly `content`; the size check avoids most reads."""
+    try:
+        return path.stat().st_size == len(content) and path.read_bytes() == content
+    except OSError:
+        return False
@@ -169,7 +169,7 @@ class NotionDeliveryService:
                         title_prop = props.get(title_property, {})
                         title_items = title_prop.get("title", [])
                         title_text = "".join(
-                            item.get("plain_text", "") for item in title_items if isinstance(item, dict)
+                            [item.get("plain_text", "") for item in title_items if isinstance(item, dict)]
                         ).strip()
                         if title_text:
                             titles.add(title_text.lower())
@@ -9,6 +9,7 @@ import os
 import re
 import threading
 import time
+from functools import lru_cache
 
 from openai import OpenAI
 
@@ -110,27 +111,42 @@ BROAD_KEYWORDS = [
 ]
 
 
+_SEPARATOR_RE = re.compile(r"[\s_/]+")
+
+
 def _normalize_text(text: str) -> str:
     """Lowercase and normalize separators for robust keyword matching."""
     text = text.lower()
     text = text.replace("-", " ")
-    text = re.sub(r"[\s_/]+", " ", text)
+    text = _SEPARATOR_RE.sub(" ", text)
     return text
 
 
-def _contains_keyword(text: str, keyword: str) -> bool:
-    """Keyword match with basic word-boundary protection."""
+@lru_cache(maxsize=4096)
+def _keyword_matcher(keyword: str) -> tuple[str, re.Pattern[str] | None]:
+    """
+    Normalized keyword plus its word-boundary pattern, built once per keyword
+    (the keyword lists are fixed, every article checks all of them).
+    """
     kw = _normalize_text(keyword).strip()
-    norm_text = _normalize_text(text)
-    if not kw:
-        return False
     # 如果包含宽字符（如中文），通常不需要单词边界，因为中文没有空格分隔
-    if any(ord(c) > 0x2E7F for c in kw):
-        return kw in norm_text
+    if not kw or " " in kw or any(ord(c) > 0x2E7F for c in kw):
+        return kw, None
     # Use boundary matching for single-token keywords to avoid accidental hits.
-    if " " not in kw:
-        return re.search(rf"\b{re.escape(kw)}\b", norm_text) is not None
-    return kw in norm_text
+    return kw, re.compile(rf"\b{re.escape(kw)}\b")
+
+
+def _contains_keyword(text: str, keyword: str) -> bool:
+    """
+    Keyword match with basic word-boundary protection.
+    `text` must already be passed through _normalize_text (callers normalize once per article).
+    """
+    kw, pattern = _keyword_matcher(keyword)
+    if not kw:
+        return False
+    if pattern is None:
+        return kw in text
+    return pattern.search(text) is not None
 
 
 def check_article_substance(article: Article) -> bool:
@@ -0,0 +1,18 @@
+"""
+JSON helpers shared by the analyzer and the mail sender (共享 JSON 工具).
+orjson is used when the perf extra is installed; stdlib json otherwise.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+json_loads: Callable[[str | bytes], Any]
+# None without orjson; callers fall back to json.dumps.
+orjson_dumps: Callable[[Any], bytes] | None
+try:
+    from orjson import dumps as orjson_dumps
+    from orjson import loads as json_loads
+except ImportError:
+    orjson_dumps = None
+    json_loads = json.loads
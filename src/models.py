@@ -23,7 +23,7 @@ class Article:
     domain_tags: list[str] = field(default_factory=list)  # 六大领域标签 (multi-label)
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalyzedArticle:
     """
     分析后的文章数据模型 (Analyzed Article Model)
@@ -2,7 +2,6 @@
 
 import asyncio
 import logging
-import re
 
 from src.models import Article
 
@@ -40,7 +39,7 @@ async def _scrape_handelsblatt(max_items: int = 20) -> list[Article]:
                     if not title or not href or len(title.strip()) < 15:
                         continue
 
-                    title = re.sub(r"\s+", " ", title).strip()
+                    title = " ".join(title.split())
 
                     if href.startswith("/"):
                         href = "https://www.handelsblatt.com" + href
@@ -21,6 +21,7 @@ if callable(_unverified_context):
 from src.models import Article
 
 logger = logging.getLogger(__name__)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
 
 
 def parse_date(entry: dict) -> Optional[datetime]:
@@ -54,10 +55,9 @@ def get_content_snippet(entry: dict, max_len: int = 500) -> str:
         text = ""
 
     # Strip HTML tags simply (简单去除 HTML 标签)
-    import re
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text[:max_len]
+    text = _HTML_TAG_RE.sub(" ", text)
+    # split()/join collapses whitespace runs and trims both ends in one C pass.
+    return " ".join(text.split())[:max_len]
 
 
 def scrape_rss(name: str, url: str, language: str, category: str,
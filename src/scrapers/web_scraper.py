@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
 OBSERVED_SOURCES = {"ABB Robotics News", "Rockwell Automation Blog"}
 OBSERVATION_STATE_PATH = os.path.join("output", "source_observation.json")
 ZERO_DISABLE_THRESHOLD = 3
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
 
 # User-Agent to avoid being blocked (设置 UA 防止被反爬)
 HEADERS = {
@@ -89,9 +90,9 @@ def _clean_text(text: str, max_len: int = 500) -> str:
     """清洗并截断文本 (Clean and truncate text)."""
     if not text:
         return ""
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text[:max_len]
+    text = _HTML_TAG_RE.sub(" ", text)
+    # split()/join collapses whitespace runs and trims both ends in one C pass.
+    return " ".join(text.split())[:max_len]
 
 
 def _make_absolute(url: str, base_url: str) -> str:
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from src.delivery.email_sender import save_digest_markdown
+from src.models import AnalyzedArticle
+
+
+def _article() -> AnalyzedArticle:
+    return AnalyzedArticle(
+        category_tag="AI",
+        title_en="English Title",
+        title_de="Deutscher Titel",
+        german_context="context",
+        source_name="Source",
+        source_url="https://example.com",
+        summary_en="en summary",
+        summary_de="de summary",
+    )
+
+
+class TestDigestMarkdown(unittest.TestCase):
+    def test_identical_rerun_keeps_existing_file(self) -> None:
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = save_digest_markdown([_article()], output_dir=out_dir, today="2026-02-20")
+            os.utime(path, (0, 0))
+
+            save_digest_markdown([_article()], output_dir=out_dir, today="2026-02-20")
+            self.assertEqual(os.stat(path).st_mtime, 0)
+
+            save_digest_markdown([], output_dir=out_dir, today="2026-02-20")
+            self.assertNotEqual(os.stat(path).st_mtime, 0)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("**0**", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from types import SimpleNamespace
+
+from src.delivery.email_sender import render_digest
+from src.models import AnalyzedArticle
+
+
+def _article(title_en: str) -> AnalyzedArticle:
+    return AnalyzedArticle(
+        category_tag="AI",
+        title_en=title_en,
+        title_de="Deutscher Titel",
+        german_context="context",
+        source_name="Source",
+        source_url="https://example.com",
+        summary_en="en summary",
+        summary_de="de summary",
+    )
+
+
+class TestEmailAutoescape(unittest.TestCase):
+    def test_article_fields_are_html_escaped(self) -> None:
+        article = _article("Robots <script>alert(1)</script> & cobots")
+        profile = SimpleNamespace(language="en", persona="student")
+
+        html = render_digest([article], today="2026-02-20", profile=profile)
+
+        self.assertNotIn("<script>", html)
+        self.assertIn("Robots &lt;script&gt;alert(1)&lt;/script&gt; &amp; cobots", html)
+        self.assertIn("Selected <strong>1</strong> relevant updates today", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import smtplib
+import unittest
+from email import message_from_bytes
+from email.policy import default
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.delivery import email_sender
+from src.delivery.email_sender import SMTPPool
+from src.models import AnalyzedArticle
+
+
+def _server() -> MagicMock:
+    server = MagicMock()
+    server.noop.return_value = (250, b"OK")
+    server.sendmail.return_value = {}
+    return server
+
+
+class TestSMTPPool(unittest.TestCase):
+    @patch("src.delivery.email_sender.smtplib.SMTP")
+    def test_session_is_reused_across_sends(self, mock_smtp):
+        server = _server()
+        mock_smtp.return_value = server
+        pool = SMTPPool("smtp.example.com", 587, "user", "secret")
+
+        pool.sendmail("a@example.com", ["b@example.com"], "first")
+        pool.sendmail("a@example.com", ["c@example.com"], "second")
+
+        self.assertEqual(mock_smtp.call_count, 1)
+        server.login.assert_called_once_with("user", "secret")
+        self.assertEqual(server.sendmail.call_count, 2)
+
+    @patch("src.delivery.email_sender.smtplib.SMTP")
+    def test_reconnects_after_server_disconnect(self, mock_smtp):
+        stale, fresh = _server(), _server()
+        stale.sendmail.side_effect = smtplib.SMTPServerDisconnected("closed")
+        mock_smtp.side_effect = [stale, fresh]
+        pool = SMTPPool("smtp.example.com", 587, "user", "secret")
+
+        pool.sendmail("a@example.com", ["b@example.com"], "body")
+
+        self.assertEqual(mock_smtp.call_count, 2)
+        fresh.sendmail.assert_called_once_with("a@example.com", ["b@example.com"], "body", [])
+
+    @patch("src.delivery.email_sender.smtplib.SMTP")
+    def test_failed_noop_opens_new_session(self, mock_smtp):
+        stale, fresh = _server(), _server()
+        mock_smtp.side_effect = [stale, fresh]
+        pool = SMTPPool("smtp.example.com", 587, "user", "secret")
+        pool.sendmail("a@example.com", ["b@example.com"], "first")
+
+        stale.noop.side_effect = smtplib.SMTPServerDisconnected("idle timeout")
+        pool.sendmail("a@example.com", ["b@example.com"], "second")
+
+        self.assertEqual(mock_smtp.call_count, 2)
+        fresh.sendmail.assert_called_once()
+
+    @patch.object(email_sender, "SMTP_MAX_RECIPIENTS", 2)
+    @patch("src.delivery.email_sender.smtplib.SMTP")
+    def test_large_recipient_list_is_split_into_envelopes(self, mock_smtp):
+        server = _server()
+        server.sendmail.side_effect = [{}, {"c@example.com": (550, b"no")}, {}]
+        mock_smtp.return_value = server
+        pool = SMTPPool("smtp.example.com", 587, "user", "secret")
+        recipients = [f"{name}@example.com" for name in "abcde"]
+
+        refused = pool.sendmail("x@example.com", recipients, b"body")
+
+        groups = [call.args[1] for call in server.sendmail.call_args_list]
+        self.assertEqual(groups, [recipients[:2], recipients[2:4], recipients[4:]])
+        self.assertEqual(list(refused), ["c@example.com"])
+        self.assertEqual(mock_smtp.call_count, 1)
+
+    @patch("src.delivery.email_sender.smtplib.SMTP_SSL")
+    def test_port_465_uses_implicit_tls_without_starttls(self, mock_smtp_ssl):
+        server = _server()
+        mock_smtp_ssl.return_value = server
+        pool = SMTPPool("smtp.example.com", 465, "user", "secret")
+
+        pool.sendmail("a@example.com", ["b@example.com"], "body")
+
+        self.assertIsNotNone(mock_smtp_ssl.call_args.kwargs["context"])
+        server.starttls.assert_not_called()
+        server.login.assert_called_once_with("user", "secret")
+
+
+@patch.multiple(
+    email_sender,
+    SMTP_HOST="smtp.example.com",
+    SMTP_USER="user",
+    SMTP_PASS="secret",
+    EMAIL_TO="team@example.com",
+)
+class TestSendEmail(unittest.TestCase):
+    eight_bit = False
+
+    def _article(self) -> AnalyzedArticle:
+        return AnalyzedArticle(
+            category_tag="AI",
+            title_en="English Title",
+            title_de="Deutscher Titel",
+            german_context="context",
+            source_name="Source",
+            source_url="https://example.com",
+            summary_en="en summary – Qualitätsprüfung",
+            summary_de="de summary",
+        )
+
+    def _pool(self) -> MagicMock:
+        pool = MagicMock()
+        pool.has_extn.return_value = self.eight_bit
+        return pool
+
+    def _send(self) -> bytes:
+        pool = self._pool()
+        with patch.object(email_sender, "_get_smtp_pool", return_value=pool):
+            self.assertTrue(email_sender.send_email([self._article()], today="2026-02-20"))
+        from_addr, to_addrs, payload = pool.sendmail.call_args.args
+        self.assertEqual(to_addrs, ["team@example.com"])
+        return payload
+
+    def test_default_message_has_text_and_html_parts(self):
+        payload = self._send()
+        self.assertIn(b"multipart/alternative", payload)
+        self.assertIn(b"text/html", payload)
+
+    def test_recipients_share_one_encoded_message(self):
+        pool = self._pool()
+        with patch.object(email_sender, "_get_smtp_pool", return_value=pool), patch.object(
+            email_sender, "_build_message", wraps=email_sender._build_message
+        ) as build:
+            sent = email_sender.send_email(
+                [self._article()], today="2026-02-20", recipients=["a@example.com", "b@example.com"]
+            )
+
+        self.assertTrue(sent)
+        self.assertEqual(build.call_count, 1)
+        calls = pool.sendmail.call_args_list
+        self.assertEqual([call.args[1] for call in calls], [["a@example.com"], ["b@example.com"]])
+        self.assertIn(b"To: b@example.com", calls[1].args[2])
+        self.assertNotIn(b"a@example.com", calls[1].args[2])
+        first, second = (call.args[2].split(b"\n", 1) for call in calls)
+        self.assertEqual(first[1], second[1])
+        self.assertEqual(message_from_bytes(calls[0].args[2], policy=default)["To"], "a@example.com")
+
+    def test_one_failed_recipient_does_not_stop_the_rest(self):
+        pool = self._pool()
+        pool.sendmail.side_effect = [smtplib.SMTPRecipientsRefused({}), {}]
+        with patch.object(email_sender, "_get_smtp_pool", return_value=pool):
+            sent = email_sender.send_email(
+                [self._article()], today="2026-02-20", recipients=["a@example.com", "b@example.com"]
+            )
+
+        self.assertFalse(sent)
+        self.assertEqual(pool.sendmail.call_count, 2)
+
+    def test_subject_prefix_follows_persona(self):
+        pool = self._pool()
+        profile = SimpleNamespace(persona=" Student ", email="s@example.com", language="en")
+        with patch.object(email_sender, "_get_smtp_pool", return_value=pool):
+            email_sender.send_email([self._article()], today="2026-02-20", profile=profile)
+
+        msg = message_from_bytes(pool.sendmail.call_args.args[2], policy=default)
+        self.assertEqual(msg["Subject"], "[Student] 📅 2026-02-20 Industrial AI Digest (1)")
+        self.assertEqual(msg["To"], "s@example.com")
+
+    @patch.object(email_sender, "EMAIL_PLAIN_ONLY", True)
+    def test_plain_only_skips_html_part(self):
+        payload = self._send()
+        self.assertNotIn(b"multipart", payload)
+        self.assertNotIn(b"text/html", payload)
+        self.assertIn(b"text/plain", payload)
+
+    @patch.object(email_sender, "EMAIL_HTML_ONLY", True)
+    def test_html_only_skips_text_render(self):
+        with patch.object(email_sender, "render_digest_text") as render_text:
+            payload = self._send()
+        render_text.assert_not_called()
+        self.assertNotIn(b"multipart", payload)
+        self.assertNotIn(b"text/plain", payload)
+        self.assertIn(b"text/html", payload)
+
+    def test_bodies_are_base64_without_8bitmime(self):
+        payload = self._send()
+        self.assertIn(b"Content-Transfer-Encoding: base64", payload)
+        self.assertNotIn("Qualitätsprüfung".encode(), payload)
+
+    def test_bodies_are_raw_utf8_with_8bitmime(self):
+        self.eight_bit = True
+        payload = self._send()
+        self.assertIn(b"Content-Transfer-Encoding: 8bit", payload)
+        self.assertNotIn(b"base64", payload)
+        self.assertIn("Qualitätsprüfung".encode(), payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+
+import openai
+
+from src.analyzers import llm_analyzer
+
+
+@unittest.skipUnless(hasattr(openai, "DefaultHttpxClient"), "needs the real openai package")
+class TestHttpClient(unittest.TestCase):
+    def _client(self) -> openai.OpenAI:
+        with patch.multiple(
+            llm_analyzer, _client=None, LLM_API_KEY="test-key", PREWARM_CONNECTION=False
+        ):
+            return llm_analyzer._get_client()
+
+    def test_real_client_uses_shared_pool(self):
+        http_client = llm_analyzer._build_http_client()
+        self.assertIsInstance(http_client, openai.DefaultHttpxClient)
+        http_client.close()
+
+        client = self._client()
+        self.assertIsInstance(client, openai.OpenAI)
+        self.assertIsInstance(client._client, openai.DefaultHttpxClient)
+        client.close()
+
+    def test_pool_failure_falls_back_to_default_transport(self):
+        with patch.object(openai, "DefaultHttpxClient", side_effect=ValueError("bad limits")):
+            self.assertIsNone(llm_analyzer._build_http_client())
+            client = self._client()
+        self.assertIsInstance(client, openai.OpenAI)
+        client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
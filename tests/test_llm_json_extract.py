@@ -5,9 +5,19 @@ import sys
 if "openai" not in sys.modules:
     openai_stub = types.ModuleType("openai")
     openai_stub.OpenAI = object
+    openai_stub.APITimeoutError = type("APITimeoutError", (Exception,), {})
+    openai_stub.APIStatusError = type("APIStatusError", (Exception,), {})
     sys.modules["openai"] = openai_stub
 
-from src.analyzers.llm_analyzer import _extract_json
+from types import SimpleNamespace
+
+from src.analyzers.llm_analyzer import (
+    _consume_stream,
+    _extract_json,
+    _extract_json_with_reason,
+    _JsonObjectTracker,
+    _scan_json_state,
+)
 
 
 class TestLLMJsonExtract(unittest.TestCase):
@@ -45,6 +55,79 @@ Second line"
         self.assertEqual(data["category_tag"], "Humanoid Robotics / Industry Analysis")
         self.assertEqual(data["summary_en"], "First line\nSecond line")
 
+    def test_extracts_object_with_braces_inside_strings_from_prose(self):
+        data = _extract_json('Result: {"category_tag": "x}{", "meta": {"n": 1}} done')
+        self.assertEqual(data, {"category_tag": "x}{", "meta": {"n": 1}})
+
+    def test_failure_reason_names_strategy_and_position(self):
+        data, reason = _extract_json_with_reason('{"category_tag": "AI", "summary_en": }')
+        self.assertIsNone(data)
+        self.assertIn("repaired:", reason)
+        self.assertIn("column 38", reason)
+        self.assertEqual(_extract_json_with_reason('{"a": "b"}'), ({"a": "b"}, ""))
+
+    def test_scan_state_reports_balanced_end_depth_and_open_string(self):
+        self.assertEqual(_scan_json_state('{"a": "\\"}"}'), (11, 0, False))
+        self.assertEqual(_scan_json_state('{"a": {"b": "tru'), (-1, 2, True))
+
+
+def _stream_chunk(content: str | None, finish_reason: str | None = None) -> SimpleNamespace:
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+class _FakeStream:
+    def __init__(self, chunks: list[SimpleNamespace]) -> None:
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestStreamingParse(unittest.TestCase):
+    def test_tracker_ignores_braces_inside_strings(self):
+        tracker = _JsonObjectTracker()
+        self.assertFalse(tracker.feed('Sure: {"a": "x}{\\\\"'))
+        self.assertFalse(tracker.feed(', "b": {"c": 1}'))
+        self.assertTrue(tracker.feed("}"))
+
+    def test_consume_stream_stops_after_object_closes(self):
+        stream = _FakeStream(
+            [
+                _stream_chunk('{"category_tag": '),
+                _stream_chunk('"AI"}'),
+                _stream_chunk("\n\nExplanation that should never be read"),
+                _stream_chunk(None, finish_reason="stop"),
+            ]
+        )
+        text, finish_reason, chunks = _consume_stream(stream)
+        self.assertEqual(text, '{"category_tag": "AI"}')
+        self.assertEqual(finish_reason, "object_closed")
+        self.assertEqual(chunks, 2)
+        self.assertEqual(stream.consumed, 2)
+        self.assertTrue(stream.closed)
+        self.assertEqual(_extract_json(text)["category_tag"], "AI")
+
+    def test_tracker_keeps_escape_across_deltas(self):
+        tracker = _JsonObjectTracker()
+        self.assertFalse(tracker.feed('{"a": "x\\'))
+        self.assertFalse(tracker.feed('"}'))
+        self.assertTrue(tracker.feed('"}'))
+
+    def test_consume_stream_abandons_output_without_json(self):
+        stream = _FakeStream([_stream_chunk("Let me think. " * 200) for _ in range(3)])
+        _, finish_reason, _ = _consume_stream(stream)
+        self.assertEqual(finish_reason, "no_json")
+        self.assertEqual(stream.consumed, 1)
+        self.assertTrue(stream.closed)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import sys
+import time
+import types
+import unittest
+
+if "openai" not in sys.modules:
+    openai_stub = types.ModuleType("openai")
+    openai_stub.OpenAI = object
+    openai_stub.APITimeoutError = type("APITimeoutError", (Exception,), {})
+    openai_stub.APIStatusError = type("APIStatusError", (Exception,), {})
+    sys.modules["openai"] = openai_stub
+
+from src.analyzers.llm_analyzer import (
+    AIMDController,
+    SlidingWindowLimiter,
+    _parse_duration,
+    _retry_after_seconds,
+)
+
+
+class TestSlidingWindowLimiter(unittest.TestCase):
+    def test_requests_within_quota_do_not_wait(self):
+        limiter = SlidingWindowLimiter(rpm=3, tpm=0, window_seconds=0.3)
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_request_over_rpm_waits_for_window(self):
+        limiter = SlidingWindowLimiter(rpm=2, tpm=0, window_seconds=0.2)
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_token_quota_blocks_until_tokens_expire(self):
+        limiter = SlidingWindowLimiter(rpm=0, tpm=100, window_seconds=0.2)
+        started = time.monotonic()
+        limiter.acquire(80)
+        limiter.acquire(80)
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_single_oversized_request_is_admitted(self):
+        limiter = SlidingWindowLimiter(rpm=0, tpm=100, window_seconds=5.0)
+        started = time.monotonic()
+        limiter.acquire(500)
+        self.assertLess(time.monotonic() - started, 0.1)
+
+    def test_low_remaining_quota_pauses_until_reset(self):
+        limiter = SlidingWindowLimiter(rpm=0, tpm=0)
+        limiter.observe_headers(
+            {
+                "x-ratelimit-remaining-requests": "1",
+                "x-ratelimit-limit-requests": "100",
+                "x-ratelimit-reset-requests": "200ms",
+            }
+        )
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_healthy_remaining_quota_does_not_pause(self):
+        limiter = SlidingWindowLimiter(rpm=0, tpm=0)
+        limiter.observe_headers(
+            {"x-ratelimit-remaining-tokens": "9000", "x-ratelimit-limit-tokens": "10000"}
+        )
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertLess(time.monotonic() - started, 0.1)
+
+
+class TestRateLimitHeaders(unittest.TestCase):
+    def test_parse_duration_formats(self):
+        self.assertEqual(_parse_duration("6m0s"), 360.0)
+        self.assertAlmostEqual(_parse_duration("1.5s"), 1.5)
+        self.assertAlmostEqual(_parse_duration("20ms"), 0.02)
+        self.assertEqual(_parse_duration("12"), 12.0)
+        self.assertIsNone(_parse_duration("soon"))
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(_retry_after_seconds({"retry-after": "7"}), 7.0)
+        self.assertEqual(_retry_after_seconds({"retry-after-ms": "1500"}), 1.5)
+        self.assertIsNone(_retry_after_seconds({}))
+
+
+class TestAIMDController(unittest.TestCase):
+    def test_decrease_halves_and_respects_floor(self):
+        controller = AIMDController(c_max=8)
+        controller.decrease()
+        self.assertEqual(controller.current, 4.0)
+        for _ in range(5):
+            controller.decrease()
+        self.assertEqual(controller.current, 1.0)
+
+    def test_success_increases_up_to_ceiling(self):
+        controller = AIMDController(c_max=2, alpha=0.5)
+        controller.decrease()
+        for _ in range(10):
+            controller.on_success(0.1)
+        self.assertEqual(controller.current, 2.0)
+
+    def test_slow_latency_counts_as_congestion(self):
+        controller = AIMDController(c_max=4, latency_target=1.0)
+        controller.on_success(3.0)
+        self.assertEqual(controller.current, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import patch
+
+if "openai" not in sys.modules:
+    openai_stub = types.ModuleType("openai")
+    openai_stub.OpenAI = object
+    openai_stub.APITimeoutError = type("APITimeoutError", (Exception,), {})
+    openai_stub.APIStatusError = type("APIStatusError", (Exception,), {})
+    sys.modules["openai"] = openai_stub
+
+from src.analyzers import llm_analyzer
+from src.models import Article
+
+
+def _raw(url: str = "https://example.com/a", snippet: str = "Digital twin rollout.") -> Article:
+    return Article(
+        title="Digital twin rollout",
+        url=url,
+        source="Example",
+        content_snippet=snippet,
+        language="en",
+        category="Technology",
+    )
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        llm_analyzer._result_cache.clear()
+
+    def tearDown(self):
+        llm_analyzer._result_cache.clear()
+
+    def test_hit_rebuilds_result_for_the_new_article(self):
+        first = _raw()
+        llm_analyzer._remember_analysis(first, {"category_tag": "Digital Twin", "id": 3})
+        repost = _raw()
+        repost.source = "Syndicated"
+
+        cached = llm_analyzer._cached_analysis(repost)
+
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.category_tag, "Digital Twin")
+        self.assertIs(cached.original, repost)
+        self.assertEqual(cached.source_name, "Syndicated")
+        self.assertNotIn("id", next(iter(llm_analyzer._result_cache.values())))
+
+    def test_different_snippet_misses(self):
+        llm_analyzer._remember_analysis(_raw(), {"category_tag": "Digital Twin"})
+        self.assertIsNone(llm_analyzer._cached_analysis(_raw(snippet="Other text.")))
+
+    @patch.object(llm_analyzer, "RESULT_CACHE_MAX_ENTRIES", 2)
+    def test_least_recently_used_entry_is_dropped(self):
+        a, b, c = (_raw(url=f"https://example.com/{name}") for name in "abc")
+        llm_analyzer._remember_analysis(a, {"category_tag": "A"})
+        llm_analyzer._remember_analysis(b, {"category_tag": "B"})
+        llm_analyzer._cached_analysis(a)
+        llm_analyzer._remember_analysis(c, {"category_tag": "C"})
+
+        self.assertIsNotNone(llm_analyzer._cached_analysis(a))
+        self.assertIsNone(llm_analyzer._cached_analysis(b))
+        self.assertEqual(len(llm_analyzer._result_cache), 2)
+
+    def test_chunk_looks_each_article_up_once(self):
+        article = _raw()
+        lookup = patch.object(llm_analyzer, "_cached_analysis", return_value=None)
+        uncached = patch.object(llm_analyzer, "_analyze_uncached", return_value=None)
+        with lookup as cached_analysis, uncached as analyze:
+            llm_analyzer._analyze_chunk([article], mock=False)
+
+        cached_analysis.assert_called_once_with(article)
+        analyze.assert_called_once_with(article)
+
+
+class TestPersistedResultCache(unittest.TestCase):
+    def setUp(self):
+        llm_analyzer._result_cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.json")
+        patcher = patch.multiple(
+            llm_analyzer, RESULT_CACHE_PATH=self.path, _result_cache_loaded=False
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        llm_analyzer._result_cache.clear()
+        self.tmp.cleanup()
+
+    def test_round_trip_under_same_version(self):
+        llm_analyzer._remember_analysis(_raw(), {"category_tag": "Digital Twin"})
+        llm_analyzer._save_result_cache()
+        llm_analyzer._result_cache.clear()
+
+        llm_analyzer._load_result_cache()
+
+        self.assertEqual(llm_analyzer._cached_analysis(_raw()).category_tag, "Digital Twin")
+
+    def test_cache_from_other_model_or_prompt_is_discarded(self):
+        llm_analyzer._remember_analysis(_raw(), {"category_tag": "Digital Twin"})
+        llm_analyzer._save_result_cache()
+        llm_analyzer._result_cache.clear()
+
+        with patch.object(llm_analyzer, "LLM_MODEL", "another-model"):
+            llm_analyzer._load_result_cache()
+
+        self.assertIsNone(llm_analyzer._cached_analysis(_raw()))
+
+    def test_legacy_flat_cache_file_is_discarded(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({llm_analyzer._analysis_cache_key(_raw()): {"category_tag": "Old"}}, f)
+
+        llm_analyzer._load_result_cache()
+
+        self.assertIsNone(llm_analyzer._cached_analysis(_raw()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+if "openai" not in sys.modules:
+    openai_stub = types.ModuleType("openai")
+    openai_stub.OpenAI = object
+    openai_stub.APITimeoutError = type("APITimeoutError", (Exception,), {})
+    openai_stub.APIStatusError = type("APIStatusError", (Exception,), {})
+    sys.modules["openai"] = openai_stub
+
+from src.analyzers import llm_analyzer
+
+
+@patch.multiple(llm_analyzer, SPECULATIVE_RETRY=True, IS_LOCAL=False)
+class TestShouldSpeculate(unittest.TestCase):
+    def setUp(self):
+        for _ in range(llm_analyzer.SPECULATIVE_MIN_SAMPLES):
+            llm_analyzer._record_primary_outcome("flaky", False)
+
+    def tearDown(self):
+        llm_analyzer._source_attempts.clear()
+        llm_analyzer._source_failures.clear()
+
+    @patch.object(llm_analyzer, "STREAM_RESPONSES", True)
+    def test_streamed_calls_race_failing_sources(self):
+        self.assertTrue(llm_analyzer._should_speculate("flaky"))
+
+    @patch.multiple(llm_analyzer, STREAM_RESPONSES=False, SPECULATIVE_NON_STREAMED=False)
+    def test_non_streamed_calls_need_their_own_opt_in(self):
+        self.assertFalse(llm_analyzer._should_speculate("flaky"))
+
+    @patch.multiple(llm_analyzer, STREAM_RESPONSES=False, SPECULATIVE_NON_STREAMED=True)
+    def test_non_streamed_opt_in_allows_the_race(self):
+        self.assertTrue(llm_analyzer._should_speculate("flaky"))
+
+
+if __name__ == "__main__":
+    unittest.main()
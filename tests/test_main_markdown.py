@@ -0,0 +1,26 @@
+from concurrent.futures import Future
+
+from main import PipelineResult, _collect_markdown
+
+
+def _result() -> PipelineResult:
+    return PipelineResult(run_id="r", date="2026-02-20", strict=True, output="both")
+
+
+def test_collect_markdown_records_saved_path() -> None:
+    future: Future[str] = Future()
+    future.set_result("output/digest-2026-02-20.md")
+    result = _result()
+
+    assert _collect_markdown(future, result) is None
+    assert result.markdown_path == "output/digest-2026-02-20.md"
+
+
+def test_collect_markdown_returns_write_error() -> None:
+    future: Future[str] = Future()
+    error = OSError("disk full")
+    future.set_exception(error)
+    result = _result()
+
+    assert _collect_markdown(future, result) is error
+    assert not result.markdown_path
@@ -0,0 +1,57 @@
+import unittest
+from dataclasses import replace
+from unittest.mock import patch
+
+from src.delivery import email_sender
+from src.models import AnalyzedArticle
+
+
+def _article(german_context: str) -> AnalyzedArticle:
+    return AnalyzedArticle(
+        category_tag="AI",
+        title_en="English Title",
+        title_de="Deutscher Titel",
+        german_context=german_context,
+        source_name="Source",
+        source_url="https://example.com",
+        summary_en="en summary",
+        summary_de="de summary",
+        technician_analysis_de="Das Modell erkennt Anomalien.",
+    )
+
+
+class TestTechnicianLanguageGuard(unittest.TestCase):
+    def setUp(self) -> None:
+        email_sender._german_rewrite_cache.clear()
+
+    def tearDown(self) -> None:
+        email_sender._german_rewrite_cache.clear()
+
+    def test_rewrite_is_reused_for_repeat_sends(self) -> None:
+        article = _article("The model is used for the quality of the line.")
+        german = replace(article, german_context="Das Modell prueft die Qualitaet der Linie.")
+
+        with patch.object(email_sender, "_needs_german_rewrite", return_value=True), patch.object(
+            email_sender, "_rewrite_to_german", return_value=german
+        ) as rewrite:
+            first = email_sender._enforce_technician_language_guard([article])
+            second = email_sender._enforce_technician_language_guard([article])
+
+        self.assertEqual(rewrite.call_count, 1)
+        self.assertIs(first[0], german)
+        self.assertIs(second[0], german)
+
+    def test_failed_rewrite_is_not_cached(self) -> None:
+        article = _article("In der Montagelinie wird KI eingesetzt.")
+
+        with patch.object(email_sender, "_needs_german_rewrite", return_value=True), patch.object(
+            email_sender, "_rewrite_to_german", side_effect=lambda a: a
+        ) as rewrite:
+            email_sender._enforce_technician_language_guard([article])
+            email_sender._enforce_technician_language_guard([article])
+
+        self.assertEqual(rewrite.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.delivery import email_sender
+
+
+class TestTemplateBytecodeCache(unittest.TestCase):
+    def test_missing_cache_dir_is_created(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            cache_dir = os.path.join(root, "missing", "jinja")
+            with patch.dict(os.environ, {"JINJA_BYTECODE_CACHE_DIR": cache_dir}):
+                cache = email_sender._template_bytecode_cache()
+
+            self.assertIsNotNone(cache)
+            env = email_sender.Environment(
+                loader=email_sender.FileSystemLoader(email_sender._TEMPLATE_DIR),
+                bytecode_cache=cache,
+            )
+            text = env.get_template("digest.txt").render(
+                today="2026-02-20",
+                articles=[],
+                pending_articles=[],
+                labels=email_sender._TEXT_LABELS_NS["en"],
+            )
+            self.assertIn("2026-02-20", text)
+            self.assertTrue(os.listdir(cache_dir))
+
+    def test_unusable_cache_dir_disables_cache(self) -> None:
+        with tempfile.NamedTemporaryFile() as not_a_dir:
+            with patch.dict(os.environ, {"JINJA_BYTECODE_CACHE_DIR": not_a_dir.name}):
+                self.assertIsNone(email_sender._template_bytecode_cache())
+
+
+if __name__ == "__main__":
+    unittest.main()